@@ -0,0 +1,289 @@
+"""Read-only JSON API for the leaderboard, for phones and scripts.
+
+    python api.py --port 8502
+    GET /leaderboard?since=2026-01-01&min_rounds=6
+    GET /players/{player_id}/scores?since=2026-01-01
+    GET /rounds?limit=50&offset=0&search=2025-03
+    GET /health
+
+It runs on the standard library's ThreadingHTTPServer, separate from
+Golf_App.py, with no Streamlit session, websocket or login per viewer. Reads
+go through the same storage backend (GOLF_STORAGE), data_cache versions and
+Summary code as the app.
+
+Each response body is built once per data version and query. It is stored
+with its gzip copy and an ETag (a hash of the body), so a repeat request is
+a cache lookup and a conditional one is a 304 with no body.
+
+Writes from the app happen in another process. Set GOLF_CHANGE_STREAM=supabase
+so they invalidate the cache as they land. Without a stream, the cache is
+dropped every --refresh seconds.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+import change_feed
+import competition
+import data_cache
+import hat_timeline
+import ratings
+import season_index
+import storage
+import summary_stats
+
+SCORE_TABLES = change_feed.SCORE_TABLES
+MAX_PAGE = 200
+RESPONSES = 256
+# Bodies smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 512
+REFRESH_SECONDS = 60
+
+log = logging.getLogger(__name__)
+
+_store = None
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# --- Data, cached per data version ---
+@data_cache.cached(*SCORE_TABLES)
+def scores():
+    return _store.load_scores()
+
+
+@data_cache.cached(*SCORE_TABLES)
+def scores_index():
+    return season_index.SeasonIndex(scores())
+
+
+@data_cache.cached(*SCORE_TABLES)
+def player_rows():
+    """player_id -> row positions in scores(), in date order."""
+    df = scores()
+    return df.groupby("player_id", observed=True).indices if not df.empty else {}
+
+
+@data_cache.cached(*SCORE_TABLES)
+def rating_table():
+    engine = ratings.RatingEngine(path=None)
+    engine.rebuild(scores())
+    return engine.table()
+
+
+@data_cache.cached(*SCORE_TABLES)
+def timeline():
+    return hat_timeline.HatTimeline.build(scores())
+
+
+def _records(df):
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict("records")
+
+
+def _since(params):
+    since = params.get("since", competition.DEFAULT_SINCE)
+    try:
+        return str(pd.Timestamp(since).date())
+    except ValueError:
+        raise BadRequest(f"since must be a date, YYYY-MM-DD, not {since!r}")
+
+
+def _int(params, name, default, low=0, high=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be a whole number")
+    if value < low or (high is not None and value > high):
+        raise BadRequest(f"{name} must be between {low} and {high}" if high is not None else f"{name} must be at least {low}")
+    return value
+
+
+# --- Routes ---
+def leaderboard(params):
+    since = _since(params)
+    min_rounds = _int(params, "min_rounds", competition.DEFAULT_MIN_ROUNDS, low=1)
+    df = summary_stats.filter_min_rounds(scores_index().since(since), min_rounds)
+    summary = ratings.add_columns(summary_stats.compute_summary(df), rating_table())
+    return {
+        "since": since,
+        "min_rounds": min_rounds,
+        "hat_holder": timeline().holder(since, eligible=set(summary["Player"])),
+        "players": _records(summary),
+    }
+
+
+def player_scores(params, player_id):
+    since = pd.Timestamp(_since(params)) if "since" in params else None
+    positions = player_rows().get(player_id)
+    if positions is None:
+        raise LookupError(f"No scores for player {player_id}")
+    rows = scores().iloc[positions]
+    if since is not None:
+        rows = rows[rows["round_date"] >= since]
+    rows = rows[["round_id", "round_date", "course", "score", "birdies", "eagles", "hat"]]
+    return {
+        "player_id": player_id,
+        "player": str(scores()["player"].iloc[positions[0]]),
+        "scores": _records(rows.assign(round_date=rows["round_date"].dt.strftime("%Y-%m-%d"))),
+    }
+
+
+def rounds(params):
+    limit = _int(params, "limit", 50, low=1, high=MAX_PAGE)
+    offset = _int(params, "offset", 0)
+    search = params.get("search") or None
+    frame, total = _store.load_rounds(limit=limit, offset=offset, search=search)
+    frame = frame.assign(round_date=frame["round_date"].dt.strftime("%Y-%m-%d"))
+    return {"total": total, "limit": limit, "offset": offset, "rounds": _records(frame)}
+
+
+def route(path, params):
+    """JSON-ready payload for a GET of `path`; raises LookupError for unknown paths."""
+    parts = [p for p in path.split("/") if p]
+    if parts == ["leaderboard"]:
+        return leaderboard(params)
+    if parts == ["rounds"]:
+        return rounds(params)
+    if len(parts) == 3 and parts[0] == "players" and parts[2] == "scores" and parts[1].isdigit():
+        return player_scores(params, int(parts[1]))
+    if parts == ["health"]:
+        return {"ok": True, "data_version": data_cache.data_version()}
+    raise LookupError(f"Not found: {path}")
+
+
+def build_response(path, query):
+    """(status, body, gzipped body or None, ETag) for a GET."""
+    try:
+        status, payload = HTTPStatus.OK, route(path, dict(query))
+    except BadRequest as e:
+        status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    except LookupError as e:
+        status, payload = HTTPStatus.NOT_FOUND, {"error": str(e)}
+    body = json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+    zipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return status, body, zipped, etag
+
+
+# Built once per data version and query
+cached_response = data_cache.cached(*SCORE_TABLES, max_entries=RESPONSES)(build_response)
+
+
+def _json_default(value):
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return str(value)
+
+
+# --- HTTP ---
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so a phone reuses its connection
+    server_version = "GolfAPI/1.0"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every response with a body
+    disable_nagle_algorithm = True
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        # Sorted, so ?a=1&b=2 and ?b=2&a=1 share a cache entry
+        query = tuple(sorted(parse_qsl(url.query)))
+        path = url.path.rstrip("/") or "/"
+        # Health checks report the live data version, so they skip the cache
+        build = build_response if path == "/health" else cached_response
+        try:
+            status, body, zipped, etag = build(path, query)
+        except Exception:
+            # e.g. the database is unreachable; nothing is cached, the next request retries
+            log.exception("GET %s failed", self.path)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, b'{"error":"internal error"}',
+                       {"Content-Type": "application/json; charset=utf-8"})
+            return
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",  # may be stored, but revalidated with If-None-Match
+            "Vary": "Accept-Encoding",
+            "Content-Type": "application/json; charset=utf-8",
+        }
+        if status == HTTPStatus.OK and etag in _etags(self.headers.get("If-None-Match", "")):
+            self._send(HTTPStatus.NOT_MODIFIED, b"", headers)
+            return
+        if zipped is not None and "gzip" in self.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = zipped
+        self._send(status, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def _etags(header):
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def _refresh_every(seconds, stop):
+    # Without a change stream we can't see the app's writes; drop the cache now and then
+    while not stop.wait(seconds):
+        change_feed.publish(*SCORE_TABLES, origin="refresh")
+
+
+def serve(store, host="127.0.0.1", port=8502, refresh=REFRESH_SECONDS, quiet=True):
+    """Start the API on a background thread; returns the server (call shutdown() to stop)."""
+    global _store
+    _store = store
+    Handler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.stop_refresh = threading.Event()
+    if refresh:
+        threading.Thread(target=_refresh_every, args=(refresh, server.stop_refresh), daemon=True).start()
+    threading.Thread(target=server.serve_forever, name="api", daemon=True).start()
+    return server
+
+
+def main():
+    import os
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--refresh", type=float, default=REFRESH_SECONDS,
+                        help="seconds between cache drops when there is no change stream (0 = never)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    stream = change_feed.open_stream(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY"))
+    server = serve(storage.open_from_env(), args.host, args.port,
+                   refresh=0 if stream else args.refresh, quiet=not args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port} (change stream: {stream.name if stream else 'off'})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
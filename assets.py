@@ -0,0 +1,88 @@
+"""Down-scaled copies of the app's images.
+
+red_cap.png is a 1024px, 1.3 MB PNG that we only ever draw 20 pixels wide.
+thumbnail() writes a resized copy to .asset_cache/ the first time it is asked
+for (and again whenever the source file changes); data_uri() and img_tag()
+keep the base64 encoding in memory, so a rerun never re-reads or re-encodes
+an image.
+
+    python assets.py        # prebuild thumbnails for every image
+"""
+import base64
+import os
+import shutil
+from functools import lru_cache
+
+from PIL import Image
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ASSET_DIR, ".asset_cache")
+
+HAT_IMAGE = "red_cap.png"
+LOGO_IMAGE = "twitchers.jpg"
+BIRD_IMAGES = [
+    "Bustard.png", "bigbird.png", "duck.png", "eagle.png", "ibis.png", "kiwi.png",
+    "moa.png", "ostrich.png", "owl.png", "peacock.png", "robin.png",
+]
+
+# Icons are drawn this many pixels per CSS pixel so they stay sharp on phones
+PIXEL_DENSITY = 2
+
+
+def _source(name):
+    return name if os.path.isabs(name) else os.path.join(ASSET_DIR, name)
+
+
+@lru_cache(maxsize=None)
+def _thumbnail(name, size, mtime):
+    src = _source(name)
+    stem, ext = os.path.splitext(os.path.basename(src))
+    out = os.path.join(CACHE_DIR, f"{stem}-{size}-{int(mtime)}{ext.lower()}")
+    if os.path.exists(out):
+        return out
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with Image.open(src) as img:
+        img.thumbnail((size, size), Image.LANCZOS)
+        if ext.lower() == ".png":
+            img.save(out, optimize=True)
+        else:
+            img.convert("RGB").save(out, quality=85, optimize=True)
+
+    # Small, flat-colour images can come out bigger than the original
+    if os.path.getsize(out) >= os.path.getsize(src):
+        shutil.copyfile(src, out)
+    return out
+
+
+def thumbnail(name, size):
+    """Path to a copy of `name` scaled to fit within size x size pixels."""
+    return _thumbnail(name, size, os.path.getmtime(_source(name)))
+
+
+@lru_cache(maxsize=None)
+def _encode(path):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+def data_uri(name, size):
+    path = thumbnail(name, size)
+    mime = "image/png" if path.endswith(".png") else "image/jpeg"
+    return f"data:{mime};base64,{_encode(path)}"
+
+
+def img_tag(name, width):
+    """Inline <img> for HTML tables, sized for `width` CSS pixels."""
+    return f'<img src="{data_uri(name, width * PIXEL_DENSITY)}" width="{width}"/>'
+
+
+def build_all(size=128):
+    built = [thumbnail(HAT_IMAGE, 20 * PIXEL_DENSITY), thumbnail(LOGO_IMAGE, 240)]
+    built += [thumbnail(name, size) for name in BIRD_IMAGES]
+    return built
+
+
+if __name__ == "__main__":
+    for path in build_all():
+        print(f"{os.path.getsize(path):>8} bytes  {os.path.relpath(path, ASSET_DIR)}")
@@ -0,0 +1,101 @@
+"""Benchmark the Summary statistics against the old per-player loop.
+
+    python benchmarks/bench_summary.py                  # 10k players / 1M scores
+    python benchmarks/bench_summary.py --players 200 --scores 20000 --legacy
+
+--legacy also runs the original loop from Golf_App.py and checks the two
+tables are identical. The loop is O(players x rows), so only use it at small
+scales.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summary_stats import SUMMARY_COLUMNS, compute_summary, rank_summary  # noqa: E402
+
+
+def synthetic_scores(n_players, n_scores, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rounds = max(n_scores // 10, 1)
+    round_ids = rng.integers(1, n_rounds + 1, n_scores)
+    # Ten rounds a day keeps a million scores within a few decades of dates
+    dates = pd.Timestamp("2000-01-01") + pd.to_timedelta(round_ids // 10, unit="D")
+    return pd.DataFrame({
+        "round_id": round_ids,
+        "round_date": dates.strftime("%Y-%m-%d"),
+        "player": np.char.add("player_", rng.integers(0, n_players, n_scores).astype(str)),
+        "score": rng.integers(15, 45, n_scores),
+        "birdies": rng.integers(0, 4, n_scores),
+        "eagles": rng.integers(0, 2, n_scores),
+        "hat": rng.random(n_scores) < 0.02,
+    })
+
+
+def legacy_summary(df):
+    """The per-player loop the Summary page used before summary_stats."""
+    summary = {}
+    for player in sorted(df["player"].unique()):
+        ps = df[df["player"] == player].sort_values("round_date", kind="stable")
+        times_played = len(ps)
+        last_score = ps.iloc[-1]["score"]
+        if times_played > 1:
+            prev_score = ps.iloc[-2]["score"]
+            trend = "▲" if last_score > prev_score else "▼" if last_score < prev_score else "→"
+        else:
+            trend = ""
+        avg_score = ps["score"].mean()
+        summary[player] = {
+            "Times Played": times_played,
+            "Last Score": f"{int(last_score)} {trend}",
+            "Average": avg_score,
+            "Best Round": int(ps["score"].max()),
+            "Worst Round": int(ps["score"].min()),
+            "Avg best 6": ps["score"].nlargest(6).mean() if times_played >= 6 else avg_score,
+            "Avg worst 6": ps["score"].nsmallest(6).mean() if times_played >= 6 else avg_score,
+            "Total Birdies": ps["birdies"].sum(),
+            "Total Eagles": ps["eagles"].sum(),
+            "Total Hats": ps["hat"].sum(),
+        }
+    return rank_summary(pd.DataFrame(summary).T)
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--scores", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="also time the old loop and compare results")
+    args = parser.parse_args()
+
+    df = synthetic_scores(args.players, args.scores)
+    print(f"{df['player'].nunique()} players, {len(df)} scores")
+
+    seconds, summary = timed(compute_summary, df, repeat=args.repeat)
+    print(f"compute_summary: {seconds * 1000:.1f} ms")
+
+    if args.legacy:
+        legacy_seconds, legacy = timed(legacy_summary, df, repeat=1)
+        print(f"legacy loop:     {legacy_seconds * 1000:.1f} ms ({legacy_seconds / seconds:.0f}x slower)")
+        pd.testing.assert_frame_equal(
+            summary[SUMMARY_COLUMNS].astype(str), legacy[SUMMARY_COLUMNS].astype(str)
+        )
+        print("results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Load test the read-only JSON API (api.py) on synthetic data, fully offline.
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --players 50 --scores 20000 --clients 16 --seconds 10
+
+The API serves an in-memory SQLite database filled with synthetic tables.
+Each client thread keeps one keep-alive connection and cycles through the
+leaderboard, a player's scores and the rounds index. Three passes run:
+
+    uncached     every request rebuilds its body (api.build_response)
+    cached       the normal server, gzip accepted
+    conditional  as cached, but sending If-None-Match, so replies are 304s
+
+Clients and server share one process and one GIL, so the numbers are a
+floor. A phone on the other end of a real network costs the server less.
+"""
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api  # noqa: E402
+import storage  # noqa: E402
+from benchmarks.synthetic import fill_sqlite, synthetic_tables  # noqa: E402
+
+
+def paths(n_players):
+    return [
+        "/leaderboard?since=2020-01-01&min_rounds=6",
+        "/leaderboard?since=2023-01-01&min_rounds=6",
+        "/rounds?limit=50",
+        *[f"/players/{pid}/scores" for pid in range(1, min(n_players, 20) + 1)],
+    ]
+
+
+def client(port, urls, seconds, conditional, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags, latencies, sent = {}, [], 0
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        url = urls[i % len(urls)]
+        i += 1
+        headers = {"Accept-Encoding": "gzip"}
+        if conditional and url in etags:
+            headers["If-None-Match"] = etags[url]
+        start = time.perf_counter()
+        conn.request("GET", url, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - start)
+        sent += len(body)
+        if response.status not in (200, 304):
+            raise RuntimeError(f"{url}: HTTP {response.status} {body[:200]!r}")
+        etags[url] = response.getheader("ETag")
+    conn.close()
+    results.append((latencies, sent))
+
+
+def run_pass(port, urls, clients, seconds, conditional=False):
+    results = []
+    threads = [
+        threading.Thread(target=client, args=(port, urls, seconds, conditional, results)) for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(x for lat, _ in results for x in lat)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "requests_per_s": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "bytes_per_request": sum(sent for _, sent in results) / max(requests, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--scores", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    store = fill_sqlite(storage.SQLiteStorage(":memory:"), synthetic_tables(args.players, args.scores))
+    server = api.serve(store, port=0, refresh=0)
+    urls = paths(args.players)
+    print(f"{args.players} players, {args.scores} scores, {args.clients} clients x {args.seconds:.0f}s\n")
+
+    cached = api.cached_response
+    try:
+        passes = []
+        # The handler looks cached_response up per request; swap it for the uncached pass
+        api.cached_response = api.build_response
+        passes.append(("uncached", run_pass(server.server_port, urls, args.clients, args.seconds)))
+        api.cached_response = cached
+        passes.append(("cached", run_pass(server.server_port, urls, args.clients, args.seconds)))
+        passes.append(("conditional", run_pass(server.server_port, urls, args.clients, args.seconds, True)))
+    finally:
+        api.cached_response = cached
+        server.shutdown()
+
+    print(f"{'pass':<12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'bytes/req':>10}")
+    for name, r in passes:
+        print(f"{name:<12} {r['requests_per_s']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['bytes_per_request']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Benchmark the data and analytics paths on synthetic data, fully offline.
+
+    python benchmarks/run.py --scale small
+    python benchmarks/run.py --players 10000 --scores 1000000 --out results.json
+    python benchmarks/run.py --scale medium --compare benchmarks/results/<earlier>.json
+
+Supabase is replaced by benchmarks.synthetic.FakeSupabaseClient and SQLite
+runs in memory. Results are written as JSON (by default to
+benchmarks/results/<timestamp>.json). --compare prints the change against an
+earlier run and exits non-zero if anything got slower than --max-regression.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import chart_data  # noqa: E402
+import competition  # noqa: E402
+import exports  # noqa: E402
+import hat_timeline  # noqa: E402
+import head_to_head  # noqa: E402
+import importer  # noqa: E402
+import loaders  # noqa: E402
+import ratings  # noqa: E402
+import scores_by_day  # noqa: E402
+import season_index  # noqa: E402
+import snapshot  # noqa: E402
+import storage  # noqa: E402
+import summary_stats  # noqa: E402
+from benchmarks.synthetic import FakeSupabaseClient, fill_sqlite, flat_scores, flat_view_rows, synthetic_tables  # noqa: E402
+
+SCALES = {
+    "small": (100, 1_000),
+    "medium": (1_000, 100_000),
+    "large": (10_000, 1_000_000),
+}
+# Building nested JSON rows up front gets expensive; flatten at most this many
+FLATTEN_SAMPLE = 200_000
+# Simulated round trip for the page-load timings
+PAGE_LOAD_LATENCY = 0.05
+
+
+def edit_round_selection(store):
+    """What the Edit Round page loads: a page of the rounds index, then one round."""
+    rounds, _ = store.load_rounds(limit=50)
+    return store.load_round_scores(int(rounds["round_id"].iloc[len(rounds) // 2]))
+
+
+def import_csv(tables, csv_text):
+    """Import the whole history into an empty SQLite database with the same players and courses."""
+    target = fill_sqlite(storage.SQLiteStorage(":memory:"), {
+        **tables, "rounds": tables["rounds"].head(0), "scores": tables["scores"].head(0),
+    })
+    return importer.import_rounds(io.StringIO(csv_text), target)
+
+
+def summary(df):
+    return summary_stats.compute_summary(summary_stats.filter_min_rounds(df, 6))
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times), "runs": repeat}, result
+
+
+def run(players, scores, repeat):
+    tables = synthetic_tables(players, scores)
+    df = flat_scores(tables)
+    results = {}
+
+    def record(name, fn, rows=None, **extra):
+        stats, result = measure(fn, repeat)
+        stats["rows"] = rows if rows is not None else (len(result) if hasattr(result, "__len__") else None)
+        stats.update(extra)
+        results[name] = stats
+        print(f"{name:<28} {stats['min_s'] * 1000:>10.1f} ms  (median {stats['median_s'] * 1000:.1f} ms)")
+        return result
+
+    client = FakeSupabaseClient(tables)
+    supabase_store = storage.SupabaseStorage(client)
+    record("load_scores.supabase", supabase_store.load_scores)
+    results["load_scores.supabase"]["requests_per_load"] = client.requests // repeat
+    # The same load against a database without the scores_flat view
+    record("load_scores.supabase_nested", storage.SupabaseStorage(FakeSupabaseClient(tables, flat_view=False)).load_scores)
+
+    # What Add Round / Edit Round wait for, over a link with PAGE_LOAD_LATENCY per request
+    remote = storage.SupabaseStorage(FakeSupabaseClient(tables, latency=PAGE_LOAD_LATENCY))
+    page_loads = [remote.load_courses, remote.load_players, remote.load_rounds]
+    record("page_load.sequential", lambda: [fn() for fn in page_loads])
+    record("page_load.concurrent", lambda: loaders.run_together(*page_loads))
+
+    sample = tables["scores"].head(FLATTEN_SAMPLE)
+    nested = client.nested_scores(sample)
+    record("flatten_scores", lambda: storage.flatten_scores(nested))
+    flat = flat_view_rows(tables).head(FLATTEN_SAMPLE).to_dict("records")
+    record("flat_scores_frame", lambda: storage.flat_scores_frame(flat))
+
+    sqlite_store = fill_sqlite(storage.SQLiteStorage(":memory:"), tables)
+    record("load_scores.sqlite", sqlite_store.load_scores)
+
+    csv_text = df[["round_id", "round_date", "course", "player", "score", "birdies", "eagles", "hat"]].to_csv(index=False)
+    stats = record("import_csv.sqlite", lambda: import_csv(tables, csv_text), rows=len(df))
+    results["import_csv.sqlite"]["scores_per_s"] = round(stats["scores_per_s"])
+
+    for fmt in ["csv", "parquet"]:
+        record(f"export.{fmt}", lambda: exports.to_bytes(df, fmt), rows=len(df))
+
+    record("summary", lambda: summary(df))
+    # A start date mid-way through the history, as the Summary filter would get it
+    start = df["round_date"].iloc[len(df) // 2]
+    record("start_filter.mask", lambda: df[df["round_date"] >= start], rows=len(df))
+    record("start_filter.index_build", lambda: season_index.SeasonIndex(df), rows=len(df))
+    index = season_index.SeasonIndex(df)
+    record("start_filter.index", lambda: index.since(start), rows=len(df))
+    record("scores_by_day", lambda: scores_by_day.views(df), rows=len(df))
+    record("hat_timeline.build", lambda: hat_timeline.HatTimeline.build(df), rows=len(df))
+    record("head_to_head", lambda: head_to_head.table(head_to_head.records(df)), rows=len(df))
+    # Ratings: a full rebuild, one new round, and an edit a tenth of the way from the end
+    engine = ratings.RatingEngine(path=os.devnull)
+    record("ratings.rebuild", lambda: engine.rebuild(df), rows=len(df))
+    new_round = df[df["round_id"] == df["round_id"].max()].assign(round_id=int(df["round_id"].max()) + 1)
+    new_rows = new_round.assign(round_date=new_round["round_date"].astype(str)).to_dict("records")
+    record("ratings.add_round", lambda: engine.add_round(new_rows))
+    engine.rebuild(df)
+    edited = engine.history[len(engine.history) * 9 // 10]
+    record("ratings.replay_last_10pct", lambda: engine.replay_from(edited[0], edited[1], df), rows=len(df))
+    record("chart_points", lambda: chart_data.trend_points(df)[0], rows=len(df))
+    # Static snapshot: the full bundle, and the fingerprint an --incremental run stops at
+    since = df["round_date"].iloc[len(df) // 2]
+    record("snapshot.build", lambda: snapshot.build(df, since), rows=len(df))
+    record("snapshot.fingerprint", lambda: snapshot.fingerprint(df, since, competition.DEFAULT_MIN_ROUNDS), rows=len(df))
+    record("edit_round.supabase", lambda: edit_round_selection(supabase_store))
+    record("edit_round.sqlite", lambda: edit_round_selection(sqlite_store))
+    return results
+
+
+def compare(results, results_meta, baseline_path, max_regression):
+    with open(baseline_path) as f:
+        saved = json.load(f)
+    baseline = saved["results"]
+    worst = 0.0
+    print(f"\nvs {baseline_path}:")
+    meta = saved.get("meta", {})
+    if (meta.get("players"), meta.get("scores")) != (results_meta["players"], results_meta["scores"]):
+        print(f"(note: baseline ran {meta.get('players')} players / {meta.get('scores')} scores)")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        ratio = stats["min_s"] / baseline[name]["min_s"]
+        worst = max(worst, ratio)
+        flag = "  <-- slower" if ratio > max_regression else ""
+        print(f"{name:<28} {ratio:>6.2f}x{flag}")
+    return worst <= max_regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--players", type=int, help="overrides --scale")
+    parser.add_argument("--scores", type=int, help="overrides --scale")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="JSON results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25)
+    args = parser.parse_args()
+
+    players, scores = SCALES[args.scale]
+    players = args.players or players
+    scores = args.scores or scores
+    print(f"{players} players, {scores} scores, best of {args.repeat}\n")
+
+    results = run(players, scores, args.repeat)
+
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "players": players,
+        "scores": scores,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+    }
+    out = args.out or os.path.join(ROOT, "benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nWrote {out}")
+
+    if args.compare and not compare(results, meta, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Synthetic competition data for the benchmarks.
+
+synthetic_tables() builds players, courses, rounds and scores frames shaped
+like the real tables. FakeSupabaseClient serves them through the small part
+of the supabase-py query API that storage.SupabaseStorage uses: the flat
+scores_flat view, or (flat_view=False) only the nested
+players(...)/rounds(courses(...)) embed, so both Supabase code paths can be
+timed offline. fill_sqlite() loads the same tables into a SQLiteStorage.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from postgrest.exceptions import APIError
+
+import storage
+
+
+def synthetic_tables(n_players=100, n_scores=1_000, n_courses=30, players_per_round=10, years=5, seed=0):
+    rng = np.random.default_rng(seed)
+    players_per_round = min(players_per_round, n_players)
+    n_rounds = max(-(-n_scores // players_per_round), 1)
+
+    players = pd.DataFrame({
+        "player_id": np.arange(1, n_players + 1),
+        "name": [f"Player {i:05d}" for i in range(1, n_players + 1)],
+        "full_name": [f"Synthetic Player {i}" for i in range(1, n_players + 1)],
+        "image_url": None,
+    })
+    courses = pd.DataFrame({
+        "course_id": np.arange(1, n_courses + 1),
+        "name": [f"Course {i:03d}" for i in range(1, n_courses + 1)],
+    })
+
+    # Rounds spread evenly over `years`, in round_id order
+    days = np.arange(n_rounds) * (365 * years) // n_rounds
+    rounds = pd.DataFrame({
+        "round_id": np.arange(1, n_rounds + 1),
+        "round_date": (pd.Timestamp("2020-01-01") + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+        "course_id": rng.integers(1, n_courses + 1, n_rounds),
+    })
+
+    # Each round gets players_per_round distinct players: a random offset and
+    # a fixed stride through the player list.
+    stride = max(n_players // players_per_round, 1)
+    offsets = rng.integers(0, n_players, n_rounds)
+    player_idx = (offsets[:, None] + np.arange(players_per_round)[None, :] * stride) % n_players
+    round_ids = np.repeat(rounds["round_id"].to_numpy(), players_per_round)
+
+    n = n_rounds * players_per_round
+    scores = pd.DataFrame({
+        "round_id": round_ids,
+        "player_id": player_idx.ravel() + 1,
+        "score": rng.integers(15, 45, n),
+        "birdies": rng.integers(0, 4, n),
+        "eagles": (rng.random(n) < 0.03).astype(int),
+        "hat": rng.random(n) < (1 / players_per_round),
+    }).head(n_scores)
+
+    return {"players": players, "courses": courses, "rounds": rounds, "scores": scores}
+
+
+def flat_scores(tables):
+    """The frame load_scores() returns, built directly with merges."""
+    return storage.compact_scores(flat_view_rows(tables))
+
+
+def flat_view_rows(tables):
+    """What the scores_flat view returns: flat_scores() before compacting, dates as text."""
+    rounds = tables["rounds"].merge(tables["courses"].rename(columns={"name": "course"}), on="course_id", how="left")
+    return (
+        tables["scores"]
+        .merge(tables["players"][["player_id", "name"]].rename(columns={"name": "player"}), on="player_id", how="left")
+        .merge(rounds, on="round_id", how="left")[storage.SCORE_COLUMNS]
+    )
+
+
+# --- In-memory stand-in for the Supabase client ---
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+FILTERS = {
+    "gt": lambda s, v: s > v,
+    "gte": lambda s, v: s >= v,
+    "lt": lambda s, v: s < v,
+    "eq": lambda s, v: s == v,
+    "ilike": lambda s, v: s.str.contains(v.strip("%"), case=False, regex=False),
+}
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.order_by = []
+        self.count = None
+        self.start = 0
+        self.end = None
+        self.headers = {}
+
+    def select(self, columns="*", count=None):
+        self.count = count
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(("gt", column, value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(("gte", column, value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(("lt", column, value))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def ilike(self, column, pattern):
+        self.filters.append(("ilike", column, pattern))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def _frame(self):
+        # Filter and sort once per distinct query, not once per page
+        key = (self.table, tuple(self.filters), tuple(self.order_by))
+        if key not in self.client.views:
+            frame = self.client.tables[self.table]
+            for op, column, value in self.filters:
+                frame = frame[FILTERS[op](frame[column], value)]
+            if self.order_by:
+                columns, descending = zip(*self.order_by)
+                frame = frame.sort_values(list(columns), ascending=[not d for d in descending], kind="stable")
+            self.client.views[key] = frame
+        return self.client.views[key]
+
+    def execute(self):
+        self.client.requests += 1
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        if self.table not in self.client.tables:
+            raise APIError({"code": "PGRST205", "message": f"Could not find the table 'public.{self.table}'"})
+        frame = self._frame()
+        total = len(frame) if self.count else None
+        end = self.end + 1 if self.end is not None else len(frame)
+        # Like PostgREST, never return more than max_rows in one response
+        page = frame.iloc[self.start:min(end, self.start + self.client.max_rows)]
+        if self.table == "scores":
+            return FakeResponse(self.client.nested_scores(page), total)
+        if self.table == storage.FLAT_SCORES_VIEW:
+            # Rows are built once up front, as a database would already hold them
+            return FakeResponse([self.client.flat_records[i] for i in page.index.tolist()], total)
+        if self.table == "rounds":
+            return FakeResponse([
+                {"round_id": r, "round_date": d, "courses": {"name": c}}
+                for r, d, c in zip(page["round_id"].tolist(), page["round_date"].tolist(), page["courses.name"].tolist())
+            ], total)
+        return FakeResponse(page.to_dict("records"), total)
+
+
+class FakeSupabaseClient:
+    """Read-only stand-in: table(...).select(...).<filters>/order/range(...).execute()."""
+    supabase_key = "fake"
+
+    def __init__(self, tables, max_rows=1000, latency=0.0, flat_view=True):
+        self.max_rows = max_rows
+        self.latency = latency  # seconds added to every request, like a network round trip
+        self.requests = 0
+        self.views = {}
+        self.players = tables["players"].set_index("player_id")["name"].to_dict()
+        self.courses = tables["courses"].set_index("course_id")["name"].to_dict()
+        # Rounds carry their embedded course name, for courses!inner(name) filters
+        rounds = tables["rounds"].assign(**{"courses.name": tables["rounds"]["course_id"].map(self.courses)})
+        self.tables = {**tables, "rounds": rounds}
+        if flat_view:
+            self.tables[storage.FLAT_SCORES_VIEW] = flat_view_rows(tables)
+            self.flat_records = self.tables[storage.FLAT_SCORES_VIEW].to_dict("records")
+        self.rounds = tables["rounds"].set_index("round_id")[["round_date", "course_id"]].to_dict("index")
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def nested_scores(self, page):
+        rows = []
+        for round_id, player_id, score, birdies, eagles, hat in zip(
+            page["round_id"].tolist(), page["player_id"].tolist(), page["score"].tolist(),
+            page["birdies"].tolist(), page["eagles"].tolist(), page["hat"].tolist(),
+        ):
+            rnd = self.rounds[round_id]
+            rows.append({
+                "score": score,
+                "birdies": birdies,
+                "eagles": eagles,
+                "hat": hat,
+                "players": {"player_id": player_id, "name": self.players[player_id]},
+                "rounds": {
+                    "round_id": round_id,
+                    "round_date": rnd["round_date"],
+                    "courses": {"course_id": rnd["course_id"], "name": self.courses[rnd["course_id"]]},
+                },
+            })
+        return rows
+
+
+def fill_sqlite(storage_obj, tables):
+    """Bulk-load synthetic tables into a SQLiteStorage."""
+    conn = storage_obj.conn
+    with storage_obj.lock, conn:
+        for name, cols in [
+            ("players", ["player_id", "name", "full_name", "image_url"]),
+            ("courses", ["course_id", "name"]),
+            ("rounds", ["round_id", "round_date", "course_id"]),
+            ("scores", ["round_id", "player_id", "score", "birdies", "eagles", "hat"]),
+        ]:
+            frame = tables[name][cols].astype(object).where(tables[name][cols].notna(), None)
+            conn.executemany(
+                f"INSERT INTO {name} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                frame.itertuples(index=False, name=None),
+            )
+    return storage_obj
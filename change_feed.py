@@ -0,0 +1,223 @@
+"""Change notifications between the sessions of one app process.
+
+Every write goes through publish(). It bumps the touched tables in
+data_cache, which drops only the cached loaders and derived views that read
+them, and then tells everyone waiting that something changed. The scores
+frame and everything built from it read SCORE_TABLES. Its rows also carry
+player and course names, so a write that renames or removes a player or
+course publishes "scores" as well. Adding one only touches its lookup. Each change
+gets a sequence number, so a viewer can remember the last one it rendered
+and refresh when a newer one arrives (see Golf_App.live_updates()).
+
+Writes made outside this process (another app instance, the importer CLI, a
+fix in the database console) arrive through a change stream:
+
+    SupabaseStream   Supabase Realtime postgres_changes on the app's tables
+    LocalStream      an in-memory stand-in; call emit() to fake a change
+
+Set GOLF_CHANGE_STREAM to "supabase" or "local" to start one. A stream
+drains whatever has queued up and publishes it as one change, so a bulk
+import elsewhere is one refresh here and not thousands. Stream changes are
+never treated as append-only. We can't tell whether an insert from outside
+landed after our newest round, so incremental snapshots are reloaded.
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import data_cache
+
+TABLES = ("scores", "rounds", "players", "courses")
+# What the scores frame and the views derived from it depend on
+SCORE_TABLES = ("scores", "rounds")
+# Tables whose names appear in score rows
+NAMED_IN_SCORES = ("players", "courses")
+# Changes kept for changes_since(); older ones are only counted
+HISTORY = 256
+# How long a stream waits for more events before publishing what it has
+COALESCE_SECONDS = 0.2
+
+log = logging.getLogger(__name__)
+
+_cond = threading.Condition()
+_history = deque(maxlen=HISTORY)
+_seq = 0
+_listeners = {}
+
+
+class Change(NamedTuple):
+    seq: int
+    tables: tuple
+    append_only: bool
+    origin: str  # "app" for this process's own writes, else the stream's name
+    at: float
+
+
+def publish(*tables, append_only=False, origin="app"):
+    """Invalidate `tables` in data_cache and notify waiters and listeners."""
+    global _seq
+    data_cache.bump(*tables, append_only=append_only)
+    with _cond:
+        _seq += 1
+        change = Change(_seq, tuple(tables), append_only, origin, time.time())
+        _history.append(change)
+        _cond.notify_all()
+        listeners = list(_listeners.items())
+    for name, callback in listeners:
+        try:
+            callback(change)
+        except Exception:
+            log.exception("Change listener %s failed", name)
+    return change
+
+
+def latest():
+    """Sequence number of the newest change, 0 if there hasn't been one."""
+    return _seq
+
+
+def changes_since(seq):
+    """Changes newer than `seq`, oldest first (only the last HISTORY are kept)."""
+    with _cond:
+        return [c for c in _history if c.seq > seq]
+
+
+def wait(seq, timeout=None):
+    """Block until there is a change newer than `seq`; returns changes_since(seq).
+
+    Returns an empty list if `timeout` seconds pass first.
+    """
+    with _cond:
+        _cond.wait_for(lambda: _seq > seq, timeout)
+    return changes_since(seq)
+
+
+def subscribe(name, callback):
+    """Call callback(change) after every publish(); a second subscribe with the same name replaces the first."""
+    with _cond:
+        _listeners[name] = callback
+
+
+def unsubscribe(name):
+    with _cond:
+        _listeners.pop(name, None)
+
+
+# --- Change streams ---
+def _touched(table, event):
+    """Tables a change from a stream invalidates."""
+    if table in NAMED_IN_SCORES and event != "INSERT":
+        return {table, "scores"}
+    return {table}
+
+
+class _Stream:
+    """Publishes batches of (table, event) pairs from a queue on a background thread."""
+
+    name = "stream"
+
+    def __init__(self, tables=TABLES):
+        self.tables = tuple(tables)
+        self.events = queue.Queue()
+        self.published = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._pump, name=f"change-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.events.put(None)
+
+    def _pump(self):
+        while not self._stop.is_set():
+            item = self.events.get()
+            if item is None:
+                continue
+            touched = _touched(*item)
+            # Collect everything else that arrives while the first change settles
+            deadline = time.monotonic() + COALESCE_SECONDS
+            while (left := deadline - time.monotonic()) > 0:
+                try:
+                    item = self.events.get(timeout=left)
+                except queue.Empty:
+                    break
+                if item is not None:
+                    touched |= _touched(*item)
+            tables = [t for t in self.tables if t in touched]
+            if tables:
+                publish(*tables, origin=self.name)
+                self.published += 1
+
+
+class LocalStream(_Stream):
+    """Offline stand-in for a database change stream."""
+
+    name = "local"
+
+    def emit(self, table, event="INSERT"):
+        """Queue a change to `table`, as if the database had reported it."""
+        if table in self.tables:
+            self.events.put((table, event))
+
+
+class SupabaseStream(_Stream):
+    """Supabase Realtime postgres_changes for `tables`, on its own event loop thread.
+
+    The tables must be in the supabase_realtime publication
+    (Database -> Replication in the dashboard).
+    """
+
+    name = "supabase"
+
+    def __init__(self, url, key, tables=TABLES):
+        super().__init__(tables)
+        self.url = f"{url.rstrip('/')}/realtime/v1"
+        self.key = key
+
+    def start(self):
+        threading.Thread(target=self._listen_forever, name="change-supabase-listen", daemon=True).start()
+        return super().start()
+
+    def _on_change(self, payload):
+        data = payload.get("data", {})
+        self.events.put((data.get("table"), data.get("type")))
+
+    async def _listen(self):
+        from realtime import AsyncRealtimeClient
+
+        client = AsyncRealtimeClient(self.url, self.key, auto_reconnect=True)
+        await client.connect()
+        channel = client.channel("golf-changes")
+        for table in self.tables:
+            channel.on_postgres_changes("*", schema="public", table=table, callback=self._on_change)
+        await channel.subscribe()
+        await client.listen()
+
+    def _listen_forever(self):
+        while not self._stop.is_set():
+            try:
+                asyncio.run(self._listen())
+            except Exception:
+                log.exception("Supabase change stream dropped; reconnecting")
+            self._stop.wait(5)
+
+
+def open_stream(url=None, key=None):
+    """Start the stream named by GOLF_CHANGE_STREAM, or return None if it is unset."""
+    kind = os.environ.get("GOLF_CHANGE_STREAM", "").lower()
+    if not kind:
+        return None
+    if kind == "local":
+        return LocalStream().start()
+    if kind == "supabase":
+        return SupabaseStream(url, key).start()
+    raise ValueError(f"Unknown change stream: {kind!r}")
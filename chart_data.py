@@ -0,0 +1,119 @@
+"""Chart-ready frames for the score trend charts.
+
+Handing alt.Chart() the raw scores frame puts every score row into the
+Vega-Lite spec sent to the browser on each rerun. This module prepares
+smaller frames. Each chart is kept under a point budget. First the rows are
+averaged per player per week, then per month, and if a chart is still over
+budget each line is thinned with Largest-Triangle-Three-Buckets (LTTB). LTTB
+keeps the points that shape the line (peaks, dips, first and last) and drops
+the rest.
+
+Golf_App.py caches the results per data version, so a rerun with no writes
+reuses the prepared frames.
+"""
+import numpy as np
+import pandas as pd
+
+# Points per chart; Altair refuses to embed more than 5000 rows by default
+TREND_BUDGET = 2000
+PLAYER_BUDGET = 400
+# Lines on the all-players chart; beyond this the legend is unreadable anyway
+MAX_SERIES = 40
+PERIODS = [("week", "W-SUN"), ("month", "MS")]
+
+
+def lttb(x, y, n_out):
+    """Indices of the `n_out` points LTTB keeps from the series (x, y)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # First and last points are always kept; the rest go into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Keep the point making the largest triangle with the last kept
+        # point and the average of the next bucket
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, x, y, budget, by=None):
+    """Thin each line of `df` (one per `by` group) to share `budget` points."""
+    if len(df) <= budget:
+        return df
+    if by is None:
+        df = df.sort_values(x, kind="stable")
+        return df.iloc[lttb(df[x].astype("int64"), df[y], budget)]
+
+    groups = df.groupby(by, sort=False, observed=True)
+    per_series = max(budget // max(groups.ngroups, 1), 3)
+    return pd.concat([downsample(g, x, y, per_series) for _, g in groups], ignore_index=True)
+
+
+def _scores(df):
+    return df[["round_date", "player", "score", "course"]].dropna(subset=["score"])
+
+
+def trend_points(df, budget=TREND_BUDGET, max_series=MAX_SERIES):
+    """Points for the all-players trend chart, plus a description of how they were made.
+
+    Returns (points, info). points has round_date, player and score columns,
+    and course for raw rows or rounds for averaged ones.
+    """
+    frame = _scores(df)
+    info = {"rows": len(frame), "period": None, "players_total": frame["player"].nunique(), "players_shown": None}
+
+    if info["players_total"] > max_series:
+        top = frame["player"].value_counts().index[:max_series]
+        frame = frame[frame["player"].isin(top)]
+    info["players_shown"] = frame["player"].nunique()
+
+    if len(frame) > budget:
+        for period, freq in PERIODS:
+            averaged = (
+                frame.groupby(["player", pd.Grouper(key="round_date", freq=freq)], observed=True)["score"]
+                .agg(["mean", "size"])
+                .reset_index()
+                .rename(columns={"mean": "score", "size": "rounds"})
+            )
+            info["period"] = period
+            if len(averaged) <= budget:
+                break
+        frame = downsample(averaged, "round_date", "score", budget, by="player")
+
+    points = frame.sort_values(["player", "round_date"], kind="stable").reset_index(drop=True)
+    info["points"] = len(points)
+    return points, info
+
+
+def player_points(df, player, budget=PLAYER_BUDGET):
+    """One player's scores, thinned with LTTB if there are more than `budget`."""
+    frame = _scores(df[df["player"] == player])
+    return downsample(frame, "round_date", "score", budget).reset_index(drop=True)
+
+
+def stat_points(birds_eags, budget=PLAYER_BUDGET):
+    """A player's birdies/eagles lines from scores_by_day.birdies_eagles(), one per stat."""
+    frame = birds_eags.dropna(subset=["count"])
+    return downsample(frame, "round_date", "count", budget, by="stat").reset_index(drop=True)
+
+
+def caption(info):
+    """Short note under a chart whose points were averaged or thinned, else None."""
+    notes = []
+    if info["period"] is not None:
+        notes.append(f"{info['period']}ly averages: {info['points']:,} points from {info['rows']:,} scores")
+    if info["players_shown"] < info["players_total"]:
+        notes.append(f"the {info['players_shown']} most active of {info['players_total']:,} players")
+    return "Showing " + ", ".join(notes) if notes else None
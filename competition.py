@@ -0,0 +1,17 @@
+"""Competition defaults shared by Golf_App.py, api.py and snapshot.py.
+
+The app copies DEFAULT_CONFIG into each session, where Configuration can
+change it. The API and the snapshot job have no session, so they fall back
+to the same start date and minimum rounds.
+"""
+from datetime import date
+
+DEFAULT_CONFIG = {
+    "competition_start_date": date(2026, 1, 1),
+    "minimum_rounds": 6,
+    "maximum_rounds_limit": 20,
+}
+
+# As query-string and command-line defaults
+DEFAULT_SINCE = DEFAULT_CONFIG["competition_start_date"].isoformat()
+DEFAULT_MIN_ROUNDS = DEFAULT_CONFIG["minimum_rounds"]
@@ -0,0 +1,155 @@
+"""Process-wide cache for the data loaders.
+
+Golf_App.py is re-executed top to bottom on every rerun, so anything kept in
+its globals is thrown away each time. This module is imported once per
+process, so entries stored here are shared by every session and every rerun.
+
+Each table has a version number. A cached loader declares the tables it reads
+and its entries are keyed on their versions; every write calls bump() (via
+change_feed.publish()) and the next read of those tables misses. Nothing
+expires on a timer.
+
+Snapshots are a second, longer-lived store for loaders that can top
+themselves up incrementally. A write flagged as append-only (a new round)
+leaves them in place so the loader only fetches the new rows; any other
+write to their tables throws them away.
+
+A loader called with many different arguments (a view per start date, say)
+can pass max_entries to keep only its most recently used results.
+"""
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+_lock = threading.RLock()
+_versions = {}
+_entries = {}
+_resets = {}
+_snapshots = {}
+_recent = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+_data_version = 0
+
+
+def table_versions(*tables):
+    with _lock:
+        return tuple(_versions.get(t, 0) for t in tables)
+
+
+def data_version():
+    """Counter bumped on every write, whichever table it touched."""
+    return _data_version
+
+
+def snapshot_token(*tables):
+    with _lock:
+        return tuple(_resets.get(t, 0) for t in tables)
+
+
+def bump(*tables, append_only=False):
+    """Mark tables as changed and drop every entry that read them.
+
+    With append_only=True the write only added rows, so snapshots of these
+    tables are kept for incremental loading.
+    """
+    global _data_version
+    with _lock:
+        for t in tables:
+            _versions[t] = _versions.get(t, 0) + 1
+            if not append_only:
+                _resets[t] = _resets.get(t, 0) + 1
+        _data_version += 1
+
+        changed = set(tables)
+        stale = [k for k, (_, _, deps) in _entries.items() if changed & set(deps)]
+        for k in stale:
+            del _entries[k]
+        _stats["invalidations"] += len(stale)
+
+
+def cached(*tables, max_entries=None):
+    """Cache a loader until one of `tables` is bumped.
+
+    With max_entries, only that many argument combinations are kept and the
+    least recently used one is evicted first.
+
+    Cached values are shared between sessions, so callers must treat the
+    returned DataFrames as read-only (filtering into a new frame is fine).
+    """
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            with _lock:
+                # Golf_App.py redefines its loaders on every rerun, so the LRU
+                # order lives at module level, keyed by name like the entries
+                recent = _recent.setdefault(name, OrderedDict())
+                versions = table_versions(*tables)
+                entry = _entries.get(key)
+                if entry is not None and entry[0] == versions:
+                    _stats["hits"] += 1
+                    if max_entries is not None:
+                        recent[key] = None
+                        recent.move_to_end(key)
+                    return entry[1]
+                _stats["misses"] += 1
+
+            value = fn(*args, **kwargs)
+
+            with _lock:
+                # Don't store a result if a write landed while we were loading
+                if table_versions(*tables) == versions:
+                    _entries[key] = (versions, value, tables)
+                    recent = _recent.setdefault(name, OrderedDict())
+                    if max_entries is not None:
+                        recent[key] = None
+                        recent.move_to_end(key)
+                        while len(recent) > max_entries:
+                            old, _ = recent.popitem(last=False)
+                            if _entries.pop(old, None) is not None:
+                                _stats["evictions"] += 1
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot(name):
+    """Return the stored snapshot, or None if a non-append write voided it."""
+    with _lock:
+        entry = _snapshots.get(name)
+        if entry is None:
+            return None
+        token, value, tables = entry
+        if snapshot_token(*tables) != token:
+            del _snapshots[name]
+            return None
+        return value
+
+
+def store_snapshot(name, value, tables, token):
+    """Store a snapshot built from data read when snapshot_token() was `token`."""
+    with _lock:
+        if snapshot_token(*tables) == token:
+            _snapshots[name] = (token, value, tuple(tables))
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _snapshots.clear()
+        _recent.clear()
+
+
+def stats():
+    with _lock:
+        return {
+            **_stats,
+            "entries": len(_entries),
+            "snapshots": len(_snapshots),
+            "data_version": _data_version,
+            "table_versions": dict(_versions),
+        }
@@ -0,0 +1,125 @@
+"""Write tables out as CSV, Excel or Parquet.
+
+Every format is written in slices of CHUNK_ROWS rows straight into the
+output stream. A CSV slice is encoded and written, an Excel slice is
+appended through openpyxl's write-only workbook, and a Parquet slice becomes
+one row group. Columns are picked a slice at a time too. So an export never
+builds a second full-size copy of the table (a column subset, or a str of
+the whole CSV, say) on top of the frame itself.
+
+    python exports.py scores --format parquet --out scores.parquet
+    python exports.py scores --since 2026-01-01 --format xlsx --out season.xlsx
+"""
+import argparse
+import io
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+# Rows per Excel sheet, less the header
+EXCEL_MAX_ROWS = 1_048_575
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def _chunks(df, chunk_rows, columns=None):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk if columns is None else chunk[columns]
+
+
+def _write_csv(df, out, chunk_rows, columns):
+    for i, chunk in enumerate(_chunks(df, chunk_rows, columns)):
+        out.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+
+
+def _write_xlsx(df, out, chunk_rows, sheet, columns):
+    import openpyxl
+
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows won't fit in one Excel sheet; export as CSV or Parquet")
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet[:31])
+    worksheet.append([str(c) for c in (df.columns if columns is None else columns)])
+    for chunk in _chunks(df, chunk_rows, columns):
+        # openpyxl wants None for blanks, not NaN/NA
+        rows = chunk.astype(object).where(chunk.notna(), None)
+        for row in rows.itertuples(index=False, name=None):
+            worksheet.append(row)
+    workbook.save(out)
+
+
+def _write_parquet(df, out, chunk_rows, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _chunks(df, chunk_rows, columns):
+            table = pa.Table.from_pandas(chunk.rename(columns=str), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write(df, fmt, out, chunk_rows=CHUNK_ROWS, sheet="Sheet1", columns=None):
+    """Write `df` to the binary stream or path `out` in format `fmt` (a FORMATS key).
+
+    With `columns`, only those columns are written, in that order.
+    """
+    if fmt == "csv":
+        if isinstance(out, str):
+            with open(out, "wb") as f:
+                _write_csv(df, f, chunk_rows, columns)
+        else:
+            _write_csv(df, out, chunk_rows, columns)
+    elif fmt == "xlsx":
+        _write_xlsx(df, out, chunk_rows, sheet, columns)
+    elif fmt == "parquet":
+        _write_parquet(df, out, chunk_rows, columns)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def to_bytes(df, fmt, sheet="Sheet1", columns=None):
+    """The exported file as bytes, e.g. for st.download_button."""
+    out = io.BytesIO()
+    write(df, fmt, out, sheet=sheet, columns=columns)
+    # st.download_button takes bytes, not getbuffer()'s memoryview. With no
+    # other reference to `out`, CPython hands over its buffer here uncopied.
+    return out.getvalue()
+
+
+def file_name(name, fmt):
+    return f"{name}{FORMATS[fmt][1]}"
+
+
+def mime(fmt):
+    return FORMATS[fmt][0]
+
+
+def main():
+    import storage
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", choices=["scores"])
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--since", help="only rounds on or after this date, YYYY-MM-DD")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    df = storage.open_from_env().load_scores()
+    if args.since:
+        df = df[df["round_date"] >= pd.Timestamp(args.since)]
+    write(df, args.format, args.out, sheet=args.table)
+    print(f"Wrote {len(df)} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Who held the red cap, and for how long.
+
+A reign starts when the hat goes to a different player than the one holding
+it, and lasts until the next reign starts. Winning it again while holding it
+extends the reign and counts as another hat in it. HatTimeline keeps the
+reigns in round order, so the current holder is the last reign. The holder
+among a subset of players (the Summary's eligible ones, after a start date)
+walks back from the end and usually stops at the first reign.
+
+Golf_App.py keeps the timeline as a data_cache snapshot. New rounds only
+append, so extended() folds in the rows past the last round it has seen,
+the same way load_scores() tops itself up. Any other write rebuilds it.
+"""
+from datetime import date
+
+import pandas as pd
+
+REIGN_COLUMNS = ["Player", "From", "To", "Days", "Hats", "round_id"]
+
+
+def _reigns(hat_rows, previous=None):
+    """Fold hat rows (sorted by round) into a list of reigns, continuing `previous`'s last one."""
+    reigns = list(previous or [])
+    for round_date, round_id, player in zip(
+        hat_rows["round_date"].dt.date, hat_rows["round_id"].tolist(), hat_rows["player"].astype(str)
+    ):
+        last = reigns[-1] if reigns else None
+        if last is not None and last["player"] == player:
+            # Copied, so a timeline handed out earlier doesn't change under its reader
+            reigns[-1] = {**last, "last_hat": round_date, "last_round_id": round_id, "hats": last["hats"] + 1}
+        else:
+            reigns.append({
+                "player": player, "start": round_date, "round_id": round_id,
+                "last_hat": round_date, "last_round_id": round_id, "hats": 1,
+            })
+    return reigns
+
+
+class HatTimeline:
+    def __init__(self, reigns, max_round_id):
+        self.reigns = reigns
+        self.max_round_id = max_round_id
+
+    @classmethod
+    def build(cls, df):
+        """Timeline of a full scores frame, sorted by round as compact_scores() leaves it."""
+        hats = df[df["hat"].astype(bool)]
+        return cls(_reigns(hats), int(df["round_id"].max()) if not df.empty else 0)
+
+    def extended(self, df):
+        """Timeline with the rounds of `df` newer than max_round_id folded in.
+
+        If a new round is dated before the current reign began, or a round
+        that committed late brought hats below max_round_id, the whole
+        timeline is rebuilt from `df`.
+        """
+        seen = df["round_id"] <= self.max_round_id
+        if int(df["hat"][seen].sum()) != sum(reign["hats"] for reign in self.reigns):
+            return HatTimeline.build(df)
+        new = df[~seen]
+        if new.empty:
+            return self
+        hats = new[new["hat"].astype(bool)]
+        if self.reigns and not hats.empty and hats["round_date"].iloc[0].date() < self.reigns[-1]["last_hat"]:
+            return HatTimeline.build(df)
+        return HatTimeline(_reigns(hats, self.reigns), max(self.max_round_id, int(new["round_id"].max())))
+
+    # --- Reads ---
+    @property
+    def current(self):
+        """The current reign, or None if nobody has won the hat yet."""
+        return self.reigns[-1] if self.reigns else None
+
+    def holder(self, since=None, eligible=None):
+        """Latest hat winner on or after `since`, among `eligible` players if given."""
+        since = pd.Timestamp(since).date() if since is not None else None
+        for reign in reversed(self.reigns):
+            if since is not None and reign["last_hat"] < since:
+                return None
+            if eligible is None or reign["player"] in eligible:
+                return reign["player"]
+        return None
+
+    def table(self, today=None):
+        """Every reign, newest first; the current one runs to `today`."""
+        today = today or date.today()
+        ends = [r["start"] for r in self.reigns[1:]] + [None]
+        rows = [
+            (r["player"], r["start"], end, ((end or today) - r["start"]).days, r["hats"], r["round_id"])
+            for r, end in zip(self.reigns, ends)
+        ]
+        return pd.DataFrame(rows[::-1], columns=REIGN_COLUMNS)
+
+    def longest(self, n=10, today=None):
+        return self.table(today).sort_values(["Days", "From"], ascending=[False, True], kind="stable").head(n)
+
+    def days_held(self, today=None):
+        """Total days and reigns per player, most days first."""
+        reigns = self.table(today)
+        totals = reigns.groupby("Player").agg(Days=("Days", "sum"), Reigns=("Days", "size"), Hats=("Hats", "sum"))
+        return totals.sort_values("Days", ascending=False).reset_index()
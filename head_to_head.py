@@ -0,0 +1,94 @@
+"""Who beats whom: head-to-head records over shared rounds.
+
+For every pair of players, head_to_head.records() counts the rounds both
+played, the wins, losses and ties (a higher score wins, as in the Summary),
+and the total margin. Everything is done with array operations:
+
+1. Rows are grouped by round, and every score is paired with every other
+   score in the same round (np.repeat over the round sizes). That is the
+   pairwise comparison of the round x player score matrix, done only for
+   cells that hold a score. A round of n players gives n * (n - 1) pairs, and
+   players who weren't there cost nothing.
+2. np.unique and np.bincount over the flattened pair index
+   (player * players + opponent) sum those comparisons per pair of players.
+
+Golf_App.py caches the result per data version and start date.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Player", "Opponent", "Rounds", "Wins", "Losses", "Ties", "Win %", "Avg margin"]
+
+
+def _pairs(round_codes, n_rows):
+    """(left, right) row positions of every ordered pair of rows in the same round.
+
+    Rows must be sorted by round_codes.
+    """
+    starts = np.flatnonzero(np.r_[True, round_codes[1:] != round_codes[:-1]])
+    sizes = np.diff(np.r_[starts, n_rows])
+    row_size = np.repeat(sizes, sizes)
+    row_start = np.repeat(starts, sizes)
+    left = np.repeat(np.arange(n_rows), row_size)
+    # Position of each pair within its left row's run, 0..size-1
+    within = np.arange(len(left)) - np.repeat(np.cumsum(row_size) - row_size, row_size)
+    right = np.repeat(row_start, row_size) + within
+    keep = left != right
+    return left[keep], right[keep]
+
+
+def records(df):
+    """Head-to-head totals for every ordered pair of players that shared a round.
+
+    Returns a dict with `players` (sorted names) and one array per pair:
+    player and opponent (indexes into players), rounds, wins, ties and
+    margin (sum of player score minus opponent score).
+    """
+    df = df.dropna(subset=["score"])
+    df = df.sort_values("round_id", kind="stable")
+    player_codes, players = pd.factorize(df["player"].astype(str), sort=True)
+    round_codes = df["round_id"].to_numpy()
+    scores = df["score"].to_numpy(dtype="float64")
+
+    n = len(players)
+    left, right = _pairs(round_codes, len(df))
+    # Only pairs that actually met get a slot, so memory follows the data, not players²
+    cells, slot = np.unique(player_codes[left].astype("int64") * n + player_codes[right], return_inverse=True)
+    diff = scores[left] - scores[right]
+
+    def total(weights=None):
+        return np.bincount(slot, weights=weights, minlength=len(cells))
+
+    return {
+        "players": list(players),
+        "player": cells // n if n else cells,
+        "opponent": cells % n if n else cells,
+        "rounds": total().astype(int),
+        "wins": total(diff > 0).astype(int),
+        "ties": total(diff == 0).astype(int),
+        "margin": total(diff),
+    }
+
+
+def table(h2h, min_rounds=1):
+    """One row per ordered pair that shared at least `min_rounds` rounds."""
+    keep = h2h["rounds"] >= max(min_rounds, 1)
+    players = np.asarray(h2h["players"], dtype=object)
+    rounds, wins, ties = h2h["rounds"][keep], h2h["wins"][keep], h2h["ties"][keep]
+    return pd.DataFrame({
+        "Player": players[h2h["player"][keep]],
+        "Opponent": players[h2h["opponent"][keep]],
+        "Rounds": rounds,
+        "Wins": wins,
+        "Losses": rounds - wins - ties,
+        "Ties": ties,
+        "Win %": 100 * (wins + 0.5 * ties) / rounds,
+        "Avg margin": h2h["margin"][keep] / rounds,
+    }, columns=COLUMNS)
+
+
+def player_record(h2h, player, min_rounds=1):
+    """`player`'s record against each opponent, most shared rounds first."""
+    rows = table(h2h, min_rounds)
+    rows = rows[rows["Player"] == player].drop(columns="Player")
+    return rows.sort_values(["Rounds", "Opponent"], ascending=[False, True]).reset_index(drop=True)
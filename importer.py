@@ -0,0 +1,222 @@
+"""Bulk import of historical rounds from a CSV or Excel file.
+
+    python importer.py history.csv
+    python importer.py history.xlsx --sheet Scores --batch-rounds 500 --create-missing
+
+The file has one row per score, with columns round_date, course, player and
+score, plus optional birdies, eagles and hat. Rows with the same date and
+course are one round; if the file has a round_id column (as the app's
+exports do), it tells apart two rounds on the same day and course. The ids
+are only used for grouping; new rounds get new ids. All rows of one round
+must be next to each other, which is how exports and most spreadsheets
+already lay them out.
+
+The file is read in chunks (pandas for CSV, openpyxl in read-only mode for
+Excel), so a large history is never held in memory at once. Finished rounds
+are sent to Storage.insert_rounds() in batches, and each batch is one
+request and one transaction. If a batch fails, the batches before it are
+kept and the error says how many rounds made it in.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+CHUNK_ROWS = 5_000
+BATCH_ROUNDS = 200
+REQUIRED_COLUMNS = ["round_date", "course", "player", "score"]
+OPTIONAL_COLUMNS = {"birdies": 0, "eagles": 0, "hat": False}
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "hat"}
+
+
+def _source_name(source):
+    return str(getattr(source, "name", source)).lower()
+
+
+def _excel_chunks(source, chunksize, sheet=None):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = (workbook[sheet] if sheet else workbook.active).iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def read_chunks(source, chunksize=CHUNK_ROWS, sheet=None):
+    """DataFrames of up to `chunksize` rows from a .csv, .xlsx or .xlsm file (path or file object)."""
+    if _source_name(source).endswith((".xlsx", ".xlsm")):
+        yield from _excel_chunks(source, chunksize, sheet)
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+
+def _truthy(values):
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return values.fillna(0).astype(bool)
+    return values.fillna("").astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def normalise(chunk):
+    """Check the columns and coerce one chunk to plain Python-friendly types."""
+    chunk = chunk.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_"))
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    chunk = chunk.dropna(subset=["round_date", "player", "score"])
+    for col, default in OPTIONAL_COLUMNS.items():
+        if col not in chunk:
+            chunk[col] = default
+
+    return pd.DataFrame({
+        "round_id": chunk["round_id"] if "round_id" in chunk else None,
+        "round_date": pd.to_datetime(chunk["round_date"]).dt.date,
+        "course": chunk["course"].astype(str).str.strip(),
+        "player": chunk["player"].astype(str).str.strip(),
+        "score": chunk["score"].astype(int),
+        "birdies": chunk["birdies"].fillna(0).astype(int),
+        "eagles": chunk["eagles"].fillna(0).astype(int),
+        "hat": _truthy(chunk["hat"]),
+    })
+
+
+class _Names:
+    """Name -> id lookups for players and courses, optionally creating new ones."""
+
+    def __init__(self, store, create_missing):
+        self.store = store
+        self.create_missing = create_missing
+        self.created = {"players": 0, "courses": 0}
+        self._load()
+
+    def _load(self):
+        players = self.store.load_players()
+        courses = self.store.load_courses()
+        self.players = dict(zip(players["name"], players["player_id"].tolist())) if not players.empty else {}
+        self.courses = dict(zip(courses["name"], courses["course_id"].tolist())) if not courses.empty else {}
+
+    def resolve(self, chunk):
+        unknown_players = sorted(set(chunk["player"]) - set(self.players))
+        unknown_courses = sorted(set(chunk["course"]) - set(self.courses))
+        if not unknown_players and not unknown_courses:
+            return
+        if not self.create_missing:
+            problems = []
+            if unknown_players:
+                problems.append(f"unknown player(s): {', '.join(unknown_players)}")
+            if unknown_courses:
+                problems.append(f"unknown course(s): {', '.join(unknown_courses)}")
+            raise ValueError("; ".join(problems) + " (use --create-missing to add them)")
+        for name in unknown_players:
+            self.store.insert_player(name)
+        for name in unknown_courses:
+            self.store.insert_course(name)
+        self.created["players"] += len(unknown_players)
+        self.created["courses"] += len(unknown_courses)
+        self._load()
+
+
+def iter_rounds(chunks, names):
+    """(round_date, course_id, scores) for each round, in file order."""
+    current, scores = None, {}
+    seen = set()
+    for chunk in chunks:
+        chunk = normalise(chunk)
+        names.resolve(chunk)
+        for round_id, round_date, course, player, score, birdies, eagles, hat in zip(
+            chunk["round_id"], chunk["round_date"], chunk["course"], chunk["player"], chunk["score"].tolist(),
+            chunk["birdies"].tolist(), chunk["eagles"].tolist(), chunk["hat"].tolist(),
+        ):
+            key = (round_date, course, round_id)
+            if key != current:
+                if current is not None:
+                    yield current[0], names.courses[current[1]], scores
+                if key in seen:
+                    raise ValueError(f"Rows for {round_date} at {course} are not next to each other in the file")
+                seen.add(key)
+                current, scores = key, {}
+            scores[names.players[player]] = (score, birdies, eagles, hat)
+    if current is not None:
+        yield current[0], names.courses[current[1]], scores
+
+
+def _rates(stats):
+    seconds = stats["seconds"] or 1e-9
+    stats["rounds_per_s"] = stats["rounds"] / seconds
+    stats["scores_per_s"] = stats["scores"] / seconds
+    return stats
+
+
+def import_rounds(source, store, batch_rounds=BATCH_ROUNDS, chunksize=CHUNK_ROWS, sheet=None,
+                  create_missing=False, progress=None):
+    """Stream `source` into `store`; returns counts and throughput.
+
+    progress, if given, is called with the running stats after each batch.
+    """
+    start = time.perf_counter()
+    names = _Names(store, create_missing)
+    stats = {"rounds": 0, "scores": 0, "batches": 0, "seconds": 0.0, "created": names.created}
+
+    def flush(batch):
+        try:
+            store.insert_rounds(batch)
+        except Exception as e:
+            raise RuntimeError(f"Import stopped after {stats['rounds']} rounds: {e}") from e
+        stats["rounds"] += len(batch)
+        stats["scores"] += sum(len(scores) for _, _, scores in batch)
+        stats["batches"] += 1
+        stats["seconds"] = time.perf_counter() - start
+        if progress:
+            progress(_rates(dict(stats)))
+
+    batch = []
+    for round_ in iter_rounds(read_chunks(source, chunksize, sheet), names):
+        batch.append(round_)
+        if len(batch) >= batch_rounds:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    stats["seconds"] = time.perf_counter() - start
+    return _rates(stats)
+
+
+def main():
+    import storage
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help=".csv, .xlsx or .xlsm file")
+    parser.add_argument("--sheet", help="Excel sheet (default: the active one)")
+    parser.add_argument("--batch-rounds", type=int, default=BATCH_ROUNDS)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--create-missing", action="store_true", help="add unknown players and courses")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(f"{stats['rounds']:>8} rounds  {stats['scores']:>9} scores  {stats['scores_per_s']:>9.0f} scores/s")
+
+    stats = import_rounds(
+        args.path, storage.open_from_env(), batch_rounds=args.batch_rounds, chunksize=args.chunk_rows,
+        sheet=args.sheet, create_missing=args.create_missing, progress=report,
+    )
+    print(
+        f"Imported {stats['rounds']} rounds / {stats['scores']} scores in {stats['seconds']:.1f}s "
+        f"({stats['rounds_per_s']:.0f} rounds/s, {stats['scores_per_s']:.0f} scores/s); "
+        f"created {stats['created']['players']} players, {stats['created']['courses']} courses"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Save a JSON state as a checkpoint plus an append-only log of changes.
+
+Rewriting a whole saved store after every write costs time and bytes in
+proportion to the store. A Journal instead appends one JSON line per change
+to `<path>.log`, and only rewrites the checkpoint at `path` when the owner
+asks for one (after a rebuild, say) or every CHECKPOINT_EVERY changes.
+load() hands back the checkpoint and the changes logged since, for the
+owner to apply in order.
+
+Each checkpoint carries a generation number and each log line the
+generation it follows, so lines left by a crash between writing a
+checkpoint and emptying the log are skipped. A torn last line ends the log
+and makes the next save a checkpoint.
+"""
+import json
+import os
+
+CHECKPOINT_EVERY = 500
+LOG_SUFFIX = ".log"
+
+
+class Journal:
+    def __init__(self, path, checkpoint_every=CHECKPOINT_EVERY):
+        self.path = path
+        self.log_path = path + LOG_SUFFIX if path else None
+        self.checkpoint_every = checkpoint_every
+        self.generation = 0
+        self.entries = 0  # log lines since the checkpoint
+
+    def load(self):
+        """(state, changes) saved at path, or None if there is no checkpoint."""
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.generation = state.pop("generation", 0)
+        changes = []
+        try:
+            with open(self.log_path) as f:
+                for line in f:
+                    try:
+                        generation, change = json.loads(line)
+                    except ValueError:
+                        # Torn write; checkpoint before appending after it
+                        self.entries = self.checkpoint_every
+                        break
+                    if generation == self.generation:
+                        changes.append(change)
+        except OSError:
+            pass
+        self.entries = max(self.entries, len(changes))
+        return state, changes
+
+    def due(self):
+        return self.entries >= self.checkpoint_every
+
+    def checkpoint(self, state):
+        """Write `state` in full and start an empty log."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({**state, "generation": self.generation + 1}, f)
+        os.replace(tmp, self.path)
+        self.generation += 1
+        with open(self.log_path, "w"):
+            pass
+        self.entries = 0
+
+    def append(self, changes):
+        with open(self.log_path, "a") as f:
+            f.writelines(json.dumps([self.generation, c]) + "\n" for c in changes)
+        self.entries += len(changes)
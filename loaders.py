@@ -0,0 +1,53 @@
+"""Run a page's independent data loads at the same time.
+
+A page that needs courses and players used to wait for one round trip and
+then the other. run_together() submits each loader to a shared thread pool
+and waits for all of them, so the page waits about as long as the slowest
+one.
+
+Each loader runs in a copy of the caller's context, so the session's access
+token (storage.set_access_token) and the profiling records of the current
+rerun carry over into the worker thread. Loaders must not call Streamlit
+commands; the DB helpers in Golf_App.py don't.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+
+_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="loader")
+
+
+def _name(fn):
+    # functools.partial objects have no __name__ of their own
+    return getattr(fn, "__name__", None) or getattr(getattr(fn, "func", None), "__name__", repr(fn))
+
+
+class LoadError(RuntimeError):
+    """One or more loaders failed; `errors` maps loader name -> exception."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "; ".join(f"{name}: {type(e).__name__}: {e}" for name, e in errors.items())
+        super().__init__(f"Couldn't load {', '.join(errors)} ({details})")
+
+
+def run_together(*loaders):
+    """Call each zero-argument loader concurrently; returns their results in order.
+
+    If any fail, the others still finish and a LoadError naming every
+    failed loader is raised from the first failure.
+    """
+    if len(loaders) == 1:
+        return (loaders[0](),)
+
+    futures = [_pool.submit(contextvars.copy_context().run, fn) for fn in loaders]
+    results, errors = [], {}
+    for fn, future in zip(loaders, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            errors[_name(fn)] = e
+    if errors:
+        raise LoadError(errors) from next(iter(errors.values()))
+    return tuple(results)
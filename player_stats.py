@@ -0,0 +1,326 @@
+"""Running per-player totals for the Summary table.
+
+Instead of rebuilding every aggregate from the full scores table on each
+view, PlayerStatsStore keeps, for each player and for scores on or after the
+competition start date: the number of rounds, score/birdie/eagle/hat totals,
+the set of dates played, the last two scores and bounded heaps of the six
+best and six worst scores. insert_round() feeds it the new round as a delta;
+an edit rebuilds just the players it touched from their own rows. summary()
+then costs O(players) and gives the same table as
+summary_stats.compute_summary().
+
+The store is saved through a journal.Journal, so a new round appends its
+rows to the log rather than rewriting every player, and a restart doesn't
+need a full recompute. Each player also keeps the sum of row_hashes() of
+the rows counted for them. On restart the app compares those sums with the
+scores in the database (matches()), so a score edited while the app was
+down forces a rebuild even though no row was added.
+
+    python player_stats.py --since 2026-01-01           # rebuild and save
+    python player_stats.py --since 2026-01-01 --check   # compare with a full recompute
+"""
+import argparse
+import heapq
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import journal
+import summary_stats
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "player_stats.json")
+HEAP_SIZE = 6
+# A logged new round's rows, as _plain_row() gives them
+LOG_COLUMNS = ["round_date", "round_id", "player_id", "player", "score", "birdies", "eagles", "hat"]
+
+
+HASH_BITS = 2 ** 64
+
+
+def _mix(x):
+    # splitmix64's finaliser: spreads every input bit over the whole word
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _ints(values):
+    return pd.to_numeric(pd.Series(values), errors="coerce").fillna(0).to_numpy(dtype="int64")
+
+
+def row_hashes(df):
+    """64-bit hash of each score row's ids, date and values, the same in every process.
+
+    Their sum fingerprints a set of rows whatever the order, and can be kept
+    up to date as rows are added and replaced.
+    """
+    days = pd.to_datetime(df["round_date"]).to_numpy(dtype="datetime64[D]").astype("int64")
+    h = np.full(len(df), 0x9E3779B97F4A7C15, dtype="uint64")
+    for values in (df["round_id"], df["player_id"], days, df["score"], df["birdies"], df["eagles"], df["hat"]):
+        h = _mix(h ^ _ints(values).astype("uint64"))
+    return h
+
+
+def hash_sum(hashes):
+    return int(np.sum(hashes, dtype="uint64"))
+
+
+def fingerprint(df):
+    """Scored row count and row_hashes() sum of a scores frame, to spot a stale store."""
+    if df.empty:
+        return [0, 0]
+    df = df.dropna(subset=["score"])
+    return [len(df), hash_sum(row_hashes(df))]
+
+
+def edited_rows(df, player_ids, updates):
+    """Scores of `player_ids` from `df` with batch_update_scores() updates applied."""
+    rows = df[df["player_id"].isin(player_ids)].copy()
+    if not updates:
+        return rows
+    changes = pd.DataFrame(updates).set_index(["round_id", "player_id"])
+    keys = pd.MultiIndex.from_arrays([rows["round_id"], rows["player_id"]])
+    hit = keys.isin(changes.index)
+    for col in ["score", "birdies", "eagles", "hat"]:
+        if col in changes:
+            rows.loc[hit, col] = changes[col].reindex(keys[hit]).to_numpy()
+    return rows
+
+
+def _new_entry(name):
+    return {
+        "name": name,
+        "count": 0,
+        "total": 0,
+        "birdies": 0,
+        "eagles": 0,
+        "hats": 0,
+        "hash": 0,      # row_hashes() sum of the counted rows
+        "dates": set(),  # distinct round dates, for min_rounds; saved as a sorted list
+        "last": [],     # up to two [round_date, round_id, score], oldest first
+        "top": [],      # min-heap of the best scores
+        "bottom": [],   # min-heap of negated worst scores
+    }
+
+
+def _plain_row(r):
+    """[round_date, round_id, player_id, player, score, birdies, eagles, hat] of a counted row."""
+    return [
+        str(r["round_date"])[:10], int(r["round_id"]), int(r["player_id"]), r["player"], int(r["score"]),
+        0 if pd.isna(r["birdies"]) else int(r["birdies"]), 0 if pd.isna(r["eagles"]) else int(r["eagles"]),
+        bool(r["hat"]),
+    ]
+
+
+def _add_score(entry, row_hash, round_date, round_id, score, birdies, eagles, hat):
+    entry["count"] += 1
+    entry["hash"] = (entry["hash"] + row_hash) % HASH_BITS
+    entry["total"] += score
+    entry["birdies"] += birdies
+    entry["eagles"] += eagles
+    if hat:
+        entry["hats"] += 1
+    entry["dates"].add(round_date)
+
+    entry["last"] = sorted(entry["last"] + [[round_date, round_id, score]])[-2:]
+
+    heapq.heappush(entry["top"], score)
+    if len(entry["top"]) > HEAP_SIZE:
+        heapq.heappop(entry["top"])
+    heapq.heappush(entry["bottom"], -score)
+    if len(entry["bottom"]) > HEAP_SIZE:
+        heapq.heappop(entry["bottom"])
+
+
+class PlayerStatsStore:
+    def __init__(self, since, path=DEFAULT_PATH):
+        self.since = str(since)
+        self.path = path
+        self.players = {}
+        self.needs_rebuild = True
+        self.lock = threading.RLock()
+        self.journal = journal.Journal(path)
+        # Changes not saved yet; None when only a full checkpoint will do
+        self.unsaved = None
+
+    # --- Persistence ---
+    @classmethod
+    def load(cls, since, path=DEFAULT_PATH):
+        """Saved store for `since`, or None if there isn't one."""
+        store = cls(since, path)
+        saved = store.journal.load()
+        if saved is None or saved[0].get("since") != str(since):
+            return None
+        state, changes = saved
+        store._use_entries(state["players"])
+        for change in changes:
+            if "rows" in change:
+                store._add_rows(pd.DataFrame(change["rows"], columns=LOG_COLUMNS))
+            else:
+                store._use_entries(change["players"])
+        store.needs_rebuild = False
+        store.unsaved = []
+        return store
+
+    def _use_entries(self, saved):
+        for k, v in saved.items():
+            if v is None:
+                self.players.pop(int(k), None)
+            else:
+                self.players[int(k)] = {**v, "dates": set(v["dates"])}
+
+    def _saved_entries(self, player_ids):
+        return {
+            pid: {**self.players[pid], "dates": sorted(self.players[pid]["dates"])} if pid in self.players else None
+            for pid in player_ids
+        }
+
+    def save(self):
+        """Append the changes since the last save, or write a checkpoint when one is due."""
+        with self.lock:
+            if self.unsaved is None or self.journal.due():
+                self.journal.checkpoint({"since": self.since, "players": self._saved_entries(self.players)})
+            elif self.unsaved:
+                self.journal.append(self.unsaved)
+            self.unsaved = []
+
+    def _log(self, change):
+        if self.unsaved is not None:
+            self.unsaved.append(change)
+
+    # --- Updates ---
+    def _counted(self, df):
+        """Rows of `df` that count towards the totals: scored, on or after `since`."""
+        dates = pd.to_datetime(df["round_date"])
+        return df[df["score"].notna() & (dates >= pd.Timestamp(self.since))]
+
+    def _add_rows(self, df):
+        if df.empty:
+            return
+        df = self._counted(df)
+        for r, row_hash in zip(df.to_dict("records"), row_hashes(df).tolist()):
+            round_date, round_id, player_id, player, *values = _plain_row(r)
+            entry = self.players.setdefault(player_id, _new_entry(player))
+            _add_score(entry, row_hash, round_date, round_id, *values)
+
+    def rebuild(self, df):
+        """Recompute every player from a full scores frame."""
+        with self.lock:
+            self.players = {}
+            if not df.empty:
+                self._add_rows(df.sort_values(["round_id", "player_id"], kind="stable"))
+            self.needs_rebuild = False
+            self.unsaved = None
+
+    def invalidate(self):
+        """Force a rebuild, for writes that can't be applied as a delta."""
+        self.needs_rebuild = True
+
+    def add_round(self, rows):
+        """Fold in the score rows of a newly inserted round."""
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        with self.lock:
+            self._add_rows(df)
+            self._log({"rows": [_plain_row(r) for r in self._counted(df).to_dict("records")]})
+
+    def replace_players(self, player_ids, df):
+        """Rebuild the given players from `df`, their scores after an edit."""
+        player_ids = [int(pid) for pid in player_ids]
+        with self.lock:
+            for player_id in player_ids:
+                self.players.pop(player_id, None)
+            rows = df[df["player_id"].isin(player_ids)]
+            self._add_rows(rows.sort_values(["round_id", "player_id"], kind="stable"))
+            self._log({"players": self._saved_entries(player_ids)})
+
+    # --- Reads ---
+    def has_scores(self):
+        return bool(self.players)
+
+    def matches(self, df):
+        """Whether the store counts exactly the rows of the full scores frame `df`."""
+        with self.lock:
+            entries = list(self.players.values())
+        if any("hash" not in e for e in entries):
+            return False  # saved before entries had hashes
+        counted = [sum(e["count"] for e in entries), sum(e["hash"] for e in entries) % HASH_BITS]
+        return counted == fingerprint(self._counted(df) if not df.empty else df)
+
+    def _eligible(self, min_rounds):
+        return [e for e in self.players.values() if len(e["dates"]) >= min_rounds]
+
+    def summary(self, min_rounds=1):
+        """Same table as summary_stats.compute_summary() for eligible players."""
+        with self.lock:
+            entries = sorted(self._eligible(min_rounds), key=lambda e: e["name"])
+            if not entries:
+                return pd.DataFrame(columns=summary_stats.SUMMARY_COLUMNS)
+
+            index = [e["name"] for e in entries]
+            last = pd.Series([e["last"][-1][2] for e in entries], index=index)
+            prev = pd.Series([e["last"][-2][2] if len(e["last"]) > 1 else None for e in entries], index=index, dtype="float")
+            times_played = pd.Series([e["count"] for e in entries], index=index)
+            average = pd.Series([e["total"] for e in entries], index=index) / times_played
+            enough = times_played >= HEAP_SIZE
+
+            summary = pd.DataFrame({
+                "Times Played": times_played,
+                "Last Score": last.astype(int).astype(str) + " " + summary_stats.trend_arrows(last, prev),
+                "Average": average,
+                "Best Round": [max(e["top"]) for e in entries],
+                "Worst Round": [-max(e["bottom"]) for e in entries],
+                "Avg best 6": pd.Series([sum(e["top"]) / len(e["top"]) for e in entries], index=index).where(enough, average),
+                "Avg worst 6": pd.Series([-sum(e["bottom"]) / len(e["bottom"]) for e in entries], index=index).where(enough, average),
+                "Total Birdies": [e["birdies"] for e in entries],
+                "Total Eagles": [e["eagles"] for e in entries],
+                "Total Hats": [e["hats"] for e in entries],
+            }, index=index)
+            return summary_stats.rank_summary(summary)
+
+    def check(self, df, min_rounds=1):
+        """Compare with a full recompute; returns the differing rows (empty if none)."""
+        df = df[df["round_date"].astype(str).str[:10] >= self.since]
+        expected = summary_stats.compute_summary(summary_stats.filter_min_rounds(df, min_rounds))
+        actual = self.summary(min_rounds)
+        expected, actual = expected.astype(str), actual.astype(str)
+        if expected.shape != actual.shape:
+            return pd.concat([expected.assign(source="recompute"), actual.assign(source="store")])
+        diff = (expected != actual).any(axis=1)
+        return pd.concat([expected[diff].assign(source="recompute"), actual[diff].assign(source="store")])
+
+
+def main():
+    import storage
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", required=True, help="competition start date, YYYY-MM-DD")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--check", action="store_true", help="compare the saved store with a full recompute")
+    args = parser.parse_args()
+
+    df = storage.open_from_env().load_scores()
+
+    if args.check:
+        store = PlayerStatsStore.load(args.since, args.path)
+        if store is None:
+            raise SystemExit(f"No saved store for {args.since} at {args.path}")
+        diff = store.check(df)
+        if not diff.empty:
+            print(diff.to_string())
+            raise SystemExit("Player stats store is out of date; rerun without --check to rebuild it")
+        print(f"OK: {len(store.players)} players match a full recompute")
+        return
+
+    store = PlayerStatsStore(args.since, args.path)
+    store.rebuild(df)
+    store.save()
+    print(f"Rebuilt {len(store.players)} players from {len(df)} scores -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
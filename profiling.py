@@ -0,0 +1,87 @@
+"""Per-rerun timings for data calls and page phases.
+
+Golf_App.py calls start_run() at the top of every rerun. When the sidebar
+profiling panel is off, nothing is collected and traced() costs one context
+variable lookup per call. When it is on, every DB helper records its latency,
+the rows it returned and (for Supabase) the bytes received, and mark() splits
+each page into compute/render phases.
+
+Records are kept in a context variable, so threads started with
+contextvars.copy_context() report into the same rerun.
+"""
+import contextvars
+import time
+from functools import wraps
+
+_records = contextvars.ContextVar("profiling_records", default=None)
+_current_call = contextvars.ContextVar("profiling_current_call", default=None)
+_phase = contextvars.ContextVar("profiling_phase", default=None)
+
+
+def start_run(enabled):
+    """Begin a rerun; returns the list records will be appended to, or None."""
+    records = [] if enabled else None
+    _records.set(records)
+    _phase.set(None)
+    return records
+
+
+def enabled():
+    return _records.get() is not None
+
+
+def _rows(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def traced(kind="db"):
+    """Record latency and rows for each call of the wrapped function."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            records = _records.get()
+            if records is None:
+                return fn(*args, **kwargs)
+
+            entry = {"kind": kind, "name": fn.__name__, "bytes": None}
+            token = _current_call.set(entry)
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                entry["ms"] = (time.perf_counter() - start) * 1000
+                _current_call.reset(token)
+                records.append(entry)
+            entry["rows"] = _rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def add_bytes(n):
+    """Count response bytes against the traced call in progress."""
+    entry = _current_call.get()
+    if entry is not None:
+        entry["bytes"] = (entry["bytes"] or 0) + n
+
+
+def mark(name):
+    """End the current page phase (if any) and start timing `name`."""
+    records = _records.get()
+    if records is None:
+        return
+    now = time.perf_counter()
+    previous = _phase.get()
+    if previous is not None:
+        records.append({"kind": "phase", "name": previous[0], "ms": (now - previous[1]) * 1000, "rows": None, "bytes": None})
+    _phase.set((name, now) if name else None)
+
+
+def finish():
+    mark(None)
+    return _records.get()
@@ -0,0 +1,344 @@
+"""Player ratings across every round, Elo style.
+
+Averages ignore who a player was up against. In a rating, each round is a
+set of head-to-head results: a player beat, tied or lost to each other
+player on the card, and gains or loses rating depending on how likely that
+result was given both ratings. The course and conditions are the same for
+everyone in a round, so they cancel out. Rounds are processed in
+(round_date, round_id) order, every round since the first, regardless of the
+competition start date.
+
+RatingEngine keeps the current ratings and, for each round, every player's
+rating after it. A new round only touches the players in it. An edit replays
+from the edited round forward: walking back from the end of the history to
+that round gives each affected player's rating before it, then the later
+rounds are re-rated. The engine is saved through a journal.Journal, so a new
+round or an edit appends just the rounds it rated to the log, and a restart
+doesn't replay everything. Each round also keeps the player_stats.row_hashes()
+sum of its scores, so matches() can tell on restart whether the database
+still holds exactly the scores that were rated.
+
+    python ratings.py           # rebuild and save
+    python ratings.py --check   # compare the saved ratings with a full rebuild
+"""
+import argparse
+import bisect
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import journal
+import player_stats
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ratings.json")
+INITIAL_RATING = 1500.0
+# Rating points a player can move per round; larger while the rating is new
+K = 24.0
+K_PROVISIONAL = 48.0
+PROVISIONAL_ROUNDS = 10
+SCALE = 400.0
+RATING_COLUMNS = ["Rating", "Rating Rank"]
+
+
+def round_deltas(ratings, rounds_played, scores):
+    """Rating change of each player in one round, from arrays over its players.
+
+    A higher score wins, as in the Summary ranks.
+    """
+    n = len(scores)
+    if n < 2:
+        return np.zeros(n)
+    # expected[i, j]: chance i beats j; won[i, j]: 1 win, 0.5 tie, 0 loss
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[None, :] - ratings[:, None]) / SCALE))
+    won = (scores[:, None] > scores[None, :]) + 0.5 * (scores[:, None] == scores[None, :])
+    np.fill_diagonal(expected, 0.0)
+    np.fill_diagonal(won, 0.0)
+    k = np.where(rounds_played < PROVISIONAL_ROUNDS, K_PROVISIONAL, K)
+    return k * (won - expected).sum(axis=1) / (n - 1)
+
+
+def _round_key(round_date, round_id):
+    return str(round_date)[:10], int(round_id)
+
+
+def _stale_key(saved):
+    return _round_key(*saved) if saved else None
+
+
+class RatingEngine:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.players = {}   # player_id -> {"name", "rating", "rounds"}
+        self.history = []   # [round_date, round_id, {player_id: rating after}], in round order
+        self.round_hashes = {}  # round_id -> [scored rows, row_hashes() sum]
+        self.needs_rebuild = True
+        self.stale_from = None  # (round_date, round_id) to replay from on the next read
+        self.lock = threading.RLock()
+        self.journal = journal.Journal(path)
+        # Changes not saved yet; None when only a full checkpoint will do
+        self.unsaved = None
+
+    # --- Persistence ---
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Saved engine, or None if there isn't one."""
+        engine = cls(path)
+        saved = engine.journal.load()
+        if saved is None:
+            return None
+        state, changes = saved
+        engine.players = {int(k): v for k, v in state["players"].items()}
+        engine.history = [[d, r, {int(k): v for k, v in after.items()}] for d, r, after in state["history"]]
+        engine.round_hashes = {int(k): v for k, v in state.get("round_hashes", {}).items()}
+        engine.stale_from = _stale_key(state.get("stale_from"))
+        for change in changes:
+            engine._apply(change)
+        engine.needs_rebuild = False
+        engine.unsaved = []
+        return engine
+
+    def save(self):
+        """Append the changes since the last save, or write a checkpoint when one is due."""
+        with self.lock:
+            if self.unsaved is None or self.journal.due():
+                self.journal.checkpoint({
+                    "stale_from": self.stale_from, "players": self.players, "history": self.history,
+                    "round_hashes": self.round_hashes,
+                })
+            elif self.unsaved:
+                self.journal.append(self.unsaved)
+            self.unsaved = []
+
+    def _log(self, rewound_to, rounds, round_ids):
+        """Note rounds rated since the last save; `rewound_to` is the key replayed from, if any.
+
+        `round_ids` are the rounds whose hashes changed, rated or not.
+        """
+        if self.unsaved is None:
+            return
+        self.unsaved.append({
+            "from": rewound_to,
+            "rounds": rounds,
+            "names": {pid: self.players[pid]["name"] for _, _, after in rounds for pid in after},
+            "hashes": {r: self.round_hashes[r] for r in round_ids if r in self.round_hashes},
+            "stale_from": self.stale_from,
+        })
+
+    def _apply(self, change):
+        """Redo a logged change on a loaded engine."""
+        if change["from"] is not None:
+            self._rewind(_round_key(*change["from"]))
+        names = {int(k): v for k, v in change["names"].items()}
+        for round_date, round_id, after in change["rounds"]:
+            after = {int(k): v for k, v in after.items()}
+            for pid, rating in after.items():
+                entry = self.players.setdefault(pid, {"name": names.get(pid), "rating": INITIAL_RATING, "rounds": 0})
+                entry["rating"] = rating
+                entry["rounds"] += 1
+            self.history.append([round_date, round_id, after])
+        self.round_hashes.update({int(k): v for k, v in change["hashes"].items()})
+        self.stale_from = _stale_key(change["stale_from"])
+
+    # --- Updates ---
+    def _rate_round(self, round_date, round_id, player_ids, names, scores):
+        entries = []
+        for pid, name in zip(player_ids, names):
+            entries.append(self.players.setdefault(pid, {"name": name, "rating": INITIAL_RATING, "rounds": 0}))
+        deltas = round_deltas(
+            np.array([e["rating"] for e in entries], dtype="float64"),
+            np.array([e["rounds"] for e in entries]),
+            np.asarray(scores, dtype="float64"),
+        )
+        after = {}
+        for pid, entry, delta in zip(player_ids, entries, deltas.tolist()):
+            entry["rating"] = round(entry["rating"] + delta, 3)
+            entry["rounds"] += 1
+            after[pid] = entry["rating"]
+        if after:
+            self.history.append([round_date, round_id, after])
+
+    def _hash_rows(self, round_id, rows):
+        if rows:
+            self.round_hashes[round_id] = [len(rows), player_stats.hash_sum(player_stats.row_hashes(pd.DataFrame(rows)))]
+
+    def _rate_rows(self, round_date, round_id, rows):
+        self._rate_round(
+            round_date, round_id, [int(r["player_id"]) for r in rows], [r["player"] for r in rows],
+            [r["score"] for r in rows],
+        )
+
+    def _rate_frame(self, df):
+        df = df.dropna(subset=["score"])
+        if df.empty:
+            return
+        df = df.sort_values(["round_date", "round_id", "player_id"], kind="stable")
+        dates = pd.to_datetime(df["round_date"]).to_numpy(dtype="datetime64[D]")
+        round_ids = df["round_id"].to_numpy()
+        player_ids = df["player_id"].to_numpy().tolist()
+        names = df["player"].astype(object).to_numpy().tolist()
+        scores = df["score"].to_numpy(dtype="float64")
+        # One slice per round; plain lists are much cheaper than a groupby here
+        starts = np.flatnonzero(np.r_[True, (round_ids[1:] != round_ids[:-1]) | (dates[1:] != dates[:-1])])
+        ends = np.r_[starts[1:], len(df)]
+        days = np.datetime_as_string(dates[starts], unit="D").tolist()
+        hashes = np.add.reduceat(player_stats.row_hashes(df), starts).tolist()
+        for day, start, end, round_hash in zip(days, starts.tolist(), ends.tolist(), hashes):
+            round_id = int(round_ids[start])
+            self._rate_round(day, round_id, player_ids[start:end], names[start:end], scores[start:end])
+            self.round_hashes[round_id] = [end - start, round_hash]
+
+    def rebuild(self, df):
+        """Rate every round of a full scores frame from scratch."""
+        with self.lock:
+            self.players, self.history, self.round_hashes = {}, [], {}
+            self._rate_frame(df)
+            self.needs_rebuild = False
+            self.stale_from = None
+            self.unsaved = None
+
+    def invalidate(self):
+        """Force a rebuild, for writes that can't be replayed from one round."""
+        self.needs_rebuild = True
+
+    def _rewind(self, key):
+        """Drop the rounds from `key` on and restore their players' ratings as they were before it."""
+        # [date, id] sorts just before a history entry [date, id, after] with the same key
+        pos = bisect.bisect_left(self.history, list(key))
+        dropped = Counter(pid for _, _, after in self.history[pos:] for pid in after)
+        for _, round_id, _ in self.history[pos:]:
+            self.round_hashes.pop(round_id, None)
+        del self.history[pos:]
+
+        # Walk back to each player's last rating before `key`
+        pending = set()
+        for pid, n in dropped.items():
+            entry = self.players[pid]
+            entry["rounds"] -= n
+            if entry["rounds"]:
+                pending.add(pid)
+            else:
+                del self.players[pid]
+        for _, _, after in reversed(self.history):
+            if not pending:
+                break
+            for pid in pending.intersection(after):
+                self.players[pid]["rating"] = after[pid]
+                pending.discard(pid)
+
+    def replay_from(self, round_date, round_id, df):
+        """Re-rate the rounds from (round_date, round_id) on, using `df`'s scores for them.
+
+        `df` must hold every score of those rounds; earlier rows are ignored.
+        """
+        key = _round_key(round_date, round_id)
+        with self.lock:
+            self._rewind(key)
+            pos = len(self.history)
+            day, dates = pd.Timestamp(key[0]), pd.to_datetime(df["round_date"])
+            later = (dates > day) | ((dates == day) & (df["round_id"] >= key[1]))
+            self._rate_frame(df[later])
+            self.stale_from = None
+            self._log(key, self.history[pos:], [r for _, r, _ in self.history[pos:]])
+
+    def add_round(self, rows):
+        """Rate a newly inserted round from its score rows.
+
+        A round dated before the last rated one is not rated here; it is
+        marked so the next read replays from it (see stale_from).
+        """
+        if not rows:
+            return
+        key = _round_key(rows[0]["round_date"], rows[0]["round_id"])
+        rows = [r for r in rows if r["score"] is not None and not pd.isna(r["score"])]
+        with self.lock:
+            pos = len(self.history)
+            if self.history and key < (self.history[-1][0], self.history[-1][1]):
+                self.mark_stale(*key)
+            else:
+                self._rate_rows(*key, rows)
+            self._hash_rows(key[1], rows)
+            self._log(None, self.history[pos:], [key[1]])
+
+    def mark_stale(self, round_date, round_id):
+        """Replay from this round on the next read."""
+        key = _round_key(round_date, round_id)
+        with self.lock:
+            self.stale_from = key if self.stale_from is None else min(self.stale_from, key)
+
+    # --- Reads ---
+    def matches(self, df):
+        """Whether the engine has seen exactly the scores of the full scores frame `df`."""
+        with self.lock:
+            counts = list(self.round_hashes.values())
+        seen = [sum(n for n, _ in counts), sum(h for _, h in counts) % player_stats.HASH_BITS]
+        return seen == player_stats.fingerprint(df)
+
+    def table(self):
+        """Current ratings, indexed by player name."""
+        with self.lock:
+            entries = list(self.players.values())
+        return pd.DataFrame(
+            {"Rating": [e["rating"] for e in entries], "Rounds Rated": [e["rounds"] for e in entries]},
+            index=pd.Index([e["name"] for e in entries], name="player"),
+        )
+
+    def trend(self):
+        """Rating after each round: round_date, player and rating columns."""
+        with self.lock:
+            names = {pid: e["name"] for pid, e in self.players.items()}
+            rows = [(d, names.get(pid), rating) for d, _, after in self.history for pid, rating in after.items()]
+        df = pd.DataFrame(rows, columns=["round_date", "player", "rating"])
+        df["round_date"] = pd.to_datetime(df["round_date"])
+        return df
+
+    def check(self, df):
+        """Compare with a full rebuild; returns players whose rating differs (empty if none)."""
+        fresh = RatingEngine(self.path)
+        fresh.rebuild(df)
+        expected, actual = fresh.table(), self.table()
+        joined = expected.join(actual, how="outer", lsuffix=" (rebuild)", rsuffix=" (saved)")
+        diff = ~np.isclose(joined["Rating (rebuild)"], joined["Rating (saved)"], atol=0.01)
+        return joined[diff]
+
+
+def add_columns(summary_df, table):
+    """Summary table with each player's Rating and Rating Rank added."""
+    summary_df = summary_df.copy()
+    rating = table["Rating"].reindex(summary_df["Player"]).to_numpy()
+    summary_df["Rating"] = rating
+    summary_df["Rating Rank"] = summary_df["Rating"].rank(ascending=False, method="min").astype("Int64")
+    return summary_df
+
+
+def main():
+    import storage
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--check", action="store_true", help="compare the saved ratings with a full rebuild")
+    args = parser.parse_args()
+
+    df = storage.open_from_env().load_scores()
+
+    if args.check:
+        engine = RatingEngine.load(args.path)
+        if engine is None:
+            raise SystemExit(f"No saved ratings at {args.path}")
+        diff = engine.check(df)
+        if not diff.empty:
+            print(diff.to_string())
+            raise SystemExit("Saved ratings are out of date; rerun without --check to rebuild them")
+        print(f"OK: {len(engine.players)} players match a full rebuild")
+        return
+
+    engine = RatingEngine(args.path)
+    engine.rebuild(df)
+    engine.save()
+    print(f"Rated {len(engine.history)} rounds for {len(engine.players)} players -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Tables behind the "Scores by Day" page.
+
+views() builds every derived table for one date filter at once. Golf_App.py
+memoizes its result per data version and start date, so picking another
+player in a dropdown only slices frames that already exist.
+"""
+
+
+def _by_player(df, values):
+    """Wide per-round table of `values`, one column per player.
+
+    Grouping and unstacking plain floats is much faster than pivot_table()
+    over the nullable small-int columns, and gives the same table.
+    """
+    grouped = df.groupby(["round_date", "course", "player"], observed=True)[values].first()
+    return grouped.astype("float64").unstack("player")
+
+
+def _display_table(wide):
+    table = wide.reset_index()
+    table["round_date"] = table["round_date"].dt.date
+    player_cols = [c for c in table.columns if c not in ["round_date", "course"]]
+    return table[["round_date", "course"] + sorted(player_cols)]
+
+
+def scores_pivot(df):
+    """One row per round, one column of scores per player."""
+    return _display_table(_by_player(df, "score"))
+
+
+def birdies_eagles(df):
+    """Long birdies/eagles frame for the trend chart, plus a per-round table of each."""
+    birds_eags = df.melt(
+        id_vars=["round_date", "course", "player"],
+        value_vars=["birdies", "eagles"],
+        var_name="stat",
+        value_name="count"
+    )
+
+    if df.empty:
+        # With no rows there are no per-stat columns to split out of `wide`
+        empty = _display_table(_by_player(df, "score"))
+        return birds_eags, empty, empty.copy()
+
+    wide = _by_player(df, ["birdies", "eagles"])
+    birdies_table = _display_table(wide["birdies"])
+    eagles_table = _display_table(wide["eagles"])
+    return birds_eags, birdies_table, eagles_table
+
+
+def views(df):
+    """All the page's tables for an already date-filtered scores frame.
+
+    An empty frame gives empty tables, as when no round falls after the start date.
+    """
+    birds_eags, birdies_table, eagles_table = birdies_eagles(df)
+    return {
+        "scores": df,
+        "players": sorted(df["player"].unique()),
+        "scores_pivot": scores_pivot(df),
+        "birds_eags": birds_eags,
+        "birds_eags_rows": birds_eags.groupby("player", observed=True).indices,
+        "birdies_table": birdies_table,
+        "eagles_table": eagles_table,
+    }
+
+
+def player_birdies_eagles(views, player):
+    """One player's rows of the long birdies/eagles frame."""
+    rows = views["birds_eags_rows"].get(player, [])
+    return views["birds_eags"].iloc[rows]
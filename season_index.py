@@ -0,0 +1,77 @@
+"""Start-date filtering on the date-sorted scores frame.
+
+storage.compact_scores() keeps scores sorted by round_date, so "scores on or
+after a date" is always a tail of the frame. SeasonIndex finds where that
+tail starts. It does not build a boolean mask over every row.
+
+When it is built, the index records the row where each month starts and the
+row where each season starts. Seasons begin every year on the day and month
+of the competition start date. A start date on one of those boundaries is a
+dict lookup. Any other date is a binary search over the sorted dates.
+Either way the result is an iloc slice of the cached frame, not a copy, and
+the cost does not grow with years of history.
+
+Golf_App.py builds one index per data version.
+"""
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+
+def season_starts(first, last, season_start):
+    """Season start dates covering first..last; season_start is a (month, day) pair."""
+    month, day = season_start
+    starts = []
+    for year in range(first.year - 1, last.year + 1):
+        # A 29 February start falls back to the 28th in other years
+        start = date(year, month, min(day, calendar.monthrange(year, month)[1]))
+        if start <= last.date():
+            starts.append(pd.Timestamp(start))
+    return starts
+
+
+class SeasonIndex:
+    """Row offsets of month and season boundaries in a scores frame sorted by round_date."""
+
+    def __init__(self, df, season_start=(1, 1)):
+        if not df["round_date"].is_monotonic_increasing:
+            df = df.sort_values("round_date", kind="stable", ignore_index=True)
+        self.df = df
+        self.season_start = season_start
+        self._dates = df["round_date"].to_numpy(dtype="datetime64[ns]")
+
+        if df.empty:
+            self.min_date = self.max_date = None
+            self.months, self.seasons = {}, {}
+            return
+        first, last = pd.Timestamp(self._dates[0]), pd.Timestamp(self._dates[-1])
+        self.min_date, self.max_date = first.date(), last.date()
+        self.months = self._offsets(pd.date_range(first.to_period("M").to_timestamp(), last, freq="MS"))
+        self.seasons = self._offsets(season_starts(first, last, season_start))
+
+    def _offsets(self, starts):
+        starts = pd.DatetimeIndex(starts).as_unit("ns")
+        offsets = np.searchsorted(self._dates, starts.to_numpy(), side="left")
+        return dict(zip(starts, offsets.tolist()))
+
+    def __len__(self):
+        return len(self.df)
+
+    def offset(self, since):
+        """Position of the first row on or after `since`."""
+        ts = pd.Timestamp(since)
+        hit = self.seasons.get(ts)
+        if hit is None:
+            hit = self.months.get(ts)
+        if hit is None:
+            hit = int(np.searchsorted(self._dates, ts.to_datetime64(), side="left"))
+        return hit
+
+    def since(self, since):
+        """Rows on or after `since` (all rows for None), as a slice of the indexed frame."""
+        if since is None:
+            return self.df
+        start = self.offset(since)
+        return self.df if start == 0 else self.df.iloc[start:]
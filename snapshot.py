@@ -0,0 +1,309 @@
+"""Static leaderboard snapshot for the weekly email and the clubhouse screen.
+
+    python snapshot.py --out snapshot/
+    python snapshot.py --out snapshot/ --since 2026-01-01 --min-rounds 6 --incremental
+
+Loads the scores once and writes a bundle that can be served straight from
+disk:
+
+    index.html          Summary, Scores by Day tables and both charts; styles
+                        and images are inline, so the file stands alone
+    score_trends.png    score trends (averaged/thinned like the app's chart)
+    ratings.png         ratings over time for the Summary players
+    leaderboard.json    Summary rows and the hat holder
+    scores_by_day.json  scores, birdies and eagles per round
+    manifest.json       when and from what data the bundle was made
+
+The charts are drawn with Pillow, which the app already uses for its images,
+so no browser or chart renderer is needed.
+
+--incremental hashes the loaded scores together with the options. If that
+fingerprint matches manifest.json, nothing is recomputed or rewritten.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+
+import assets
+import chart_data
+import competition
+import hat_timeline
+import ratings
+import scores_by_day
+import season_index
+import summary_stats
+
+# Bump when the bundle's contents change, so --incremental rebuilds old ones
+FORMAT_VERSION = 1
+CHART_SIZE = (1200, 560)
+PALETTE = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f",
+    "#bcbd22", "#17becf", "#393b79", "#ad494a", "#637939", "#8c6d31", "#7b4173", "#3182bd",
+]
+# Legend entries drawn on a chart; the rest are only lines
+MAX_LEGEND = 20
+RANK_COLOURS = {1: "gold", 2: "silver", 3: "#cd7f32"}
+# scores_by_day.views() tables in the bundle
+DAY_TABLES = ["scores_pivot", "birdies_table", "eagles_table"]
+
+
+def fingerprint(df, since, min_rounds):
+    """Hash of the scores and the options a bundle was built from."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(json.dumps([FORMAT_VERSION, str(since), min_rounds]).encode())
+    return digest.hexdigest()
+
+
+# --- Charts ---
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has one fixed-size default font
+        return ImageFont.load_default()
+
+
+def line_chart(df, x, y, series, title, colours=None, size=CHART_SIZE):
+    """PNG bytes of one line per `series` value, x a datetime column.
+
+    `colours` maps series values to colours, so a player keeps theirs across charts.
+    """
+    width, height = size
+    left, right, top, bottom = 60, 190, 40, 40
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    font, title_font = _font(13), _font(18)
+    draw.text((left, 10), title, fill="black", font=title_font)
+
+    frame = df.dropna(subset=[y])
+    if frame.empty:
+        draw.text((left, height // 2), "No data", fill="grey", font=font)
+    else:
+        xs = frame[x].astype("int64")
+        x_min, x_max = xs.min(), max(xs.max(), xs.min() + 1)
+        y_min, y_max = float(frame[y].min()), float(frame[y].max())
+        pad = (y_max - y_min) * 0.05 or 1.0
+        y_min, y_max = y_min - pad, y_max + pad
+
+        def to_px(xv, yv):
+            px = left + (xv - x_min) / (x_max - x_min) * (width - left - right)
+            py = top + (y_max - yv) / (y_max - y_min) * (height - top - bottom)
+            return px, py
+
+        # Axes, gridlines and tick labels
+        draw.rectangle([left, top, width - right, height - bottom], outline="#999")
+        for i in range(6):
+            yv = y_min + (y_max - y_min) * i / 5
+            _, py = to_px(x_min, yv)
+            draw.line([left, py, width - right, py], fill="#eee")
+            draw.text((5, py - 7), f"{yv:.0f}", fill="#333", font=font)
+        for i in range(6):
+            xv = x_min + (x_max - x_min) * i / 5
+            px, _ = to_px(xv, y_min)
+            draw.text((px - 30, height - bottom + 8), f"{pd.Timestamp(int(xv)):%d %b %Y}", fill="#333", font=font)
+
+        groups = list(frame.sort_values(x).groupby(series, observed=True, sort=True))
+        for i, (name, group) in enumerate(groups):
+            colour = (colours or {}).get(name, PALETTE[i % len(PALETTE)])
+            points = [to_px(xv, yv) for xv, yv in zip(group[x].astype("int64"), group[y].astype("float64"))]
+            if len(points) > 1:
+                draw.line(points, fill=colour, width=2)
+            else:
+                px, py = points[0]
+                draw.ellipse([px - 2, py - 2, px + 2, py + 2], fill=colour)
+            if i < MAX_LEGEND:
+                ly = top + i * 18
+                draw.line([width - right + 12, ly + 7, width - right + 32, ly + 7], fill=colour, width=3)
+                draw.text((width - right + 38, ly), str(name)[:20], fill="black", font=font)
+        if len(groups) > MAX_LEGEND:
+            draw.text((width - right + 12, top + MAX_LEGEND * 18), f"+{len(groups) - MAX_LEGEND} more", fill="grey", font=font)
+
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+# --- Tables ---
+def _records(df):
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _rank_style(value, column):
+    if "Rank" in column and value in RANK_COLOURS:
+        return f"background-color: {RANK_COLOURS[value]}; font-weight: bold"
+    return ""
+
+
+def summary_html(summary, holder):
+    """The Summary table styled like the app's, hat icon and all."""
+    summary = summary.copy()
+    hat = assets.img_tag(assets.HAT_IMAGE, 20)
+    summary["Player"] = summary["Player"].map(lambda p: f"{p} {hat}" if p == holder else p)
+    whole = [c for c in summary.columns if c in summary_stats.RANK_COLUMNS + summary_stats.COUNT_COLUMNS
+             or c in ratings.RATING_COLUMNS]
+    return (
+        summary.style
+        .apply(lambda row: [_rank_style(v, c) for v, c in zip(row, summary.columns)], axis=1)
+        .format({**{c: "{:.0f}" for c in whole}, "Average": "{:.2f}", "Avg best 6": "{:.2f}", "Avg worst 6": "{:.2f}"},
+                na_rep="")
+        .hide(axis="index")
+        .to_html(escape=False)
+    )
+
+
+def pivot_html(table):
+    return table.to_html(index=False, na_rep="", float_format=lambda v: f"{v:.0f}", classes="pivot")
+
+
+def _data_uri(png):
+    return "data:image/png;base64," + base64.b64encode(png).decode()
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Golf Twitchers leaderboard</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 1.5rem; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; font-size: 0.9rem; }}
+th, td {{ border: 1px solid #ddd; padding: 0.25rem 0.5rem; text-align: right; }}
+th {{ background: #f4f4f4; }}
+td:first-child, th:first-child {{ text-align: left; }}
+.wrap {{ overflow-x: auto; }}
+img.chart {{ max-width: 100%; }}
+</style></head><body>
+<h1>🏌️ Golf Twitchers Competition</h1>
+<p>Scores since {since}, players with at least {min_rounds} rounds. Generated {generated}.</p>
+<h2>Player Summary</h2><div class="wrap">{summary}</div>
+<h2>📊 Score Trends</h2><img class="chart" src="{trend_png}" alt="Score trends"><p>{trend_caption}</p>
+<h2>📈 Ratings Over Time</h2><img class="chart" src="{ratings_png}" alt="Ratings over time">
+<h2>Scores by Day</h2><div class="wrap">{scores_pivot}</div>
+<h2>Birdies</h2><div class="wrap">{birdies}</div>
+<h2>Eagles</h2><div class="wrap">{eagles}</div>
+</body></html>
+"""
+
+
+# --- Bundle ---
+def build(df, since=competition.DEFAULT_SINCE, min_rounds=competition.DEFAULT_MIN_ROUNDS):
+    """Every file of the bundle as {name: bytes}, from one full scores frame."""
+    index = season_index.SeasonIndex(df)
+    recent = index.since(since)
+
+    engine = ratings.RatingEngine(path=None)
+    engine.rebuild(df)
+    summary = summary_stats.compute_summary(summary_stats.filter_min_rounds(recent, min_rounds))
+    summary = ratings.add_columns(summary, engine.table())
+    holder = hat_timeline.HatTimeline.build(df).holder(since, eligible=set(summary["Player"]))
+
+    views = scores_by_day.views(recent)
+    trend, info = chart_data.trend_points(recent)
+    rating_trend = engine.trend()
+    rating_trend = rating_trend[
+        rating_trend["player"].isin(summary["Player"]) & (rating_trend["round_date"] >= pd.Timestamp(since))
+    ]
+    rating_trend = chart_data.downsample(rating_trend, "round_date", "rating", chart_data.TREND_BUDGET, by="player")
+
+    names = sorted(set(trend["player"].astype(str)) | set(rating_trend["player"].astype(str)))
+    colours = {name: PALETTE[i % len(PALETTE)] for i, name in enumerate(names)}
+    trend_png = line_chart(trend, "round_date", "score", "player", "Score trends", colours)
+    ratings_png = line_chart(rating_trend, "round_date", "rating", "player", "Ratings over time", colours)
+
+    generated = datetime.now().isoformat(timespec="seconds")
+    html = PAGE.format(
+        since=since, min_rounds=min_rounds, generated=generated,
+        summary=summary_html(summary, holder),
+        trend_png=_data_uri(trend_png), trend_caption=chart_data.caption(info) or "",
+        ratings_png=_data_uri(ratings_png),
+        scores_pivot=pivot_html(views["scores_pivot"]),
+        birdies=pivot_html(views["birdies_table"]),
+        eagles=pivot_html(views["eagles_table"]),
+    )
+
+    def as_json(payload):
+        return json.dumps(payload, default=str, indent=1).encode("utf-8")
+
+    return {
+        "index.html": html.encode("utf-8"),
+        "score_trends.png": trend_png,
+        "ratings.png": ratings_png,
+        "leaderboard.json": as_json({
+            "since": str(since), "min_rounds": min_rounds, "generated": generated,
+            "hat_holder": holder, "players": _records(summary),
+        }),
+        "scores_by_day.json": as_json({
+            name: _records(views[name]) for name in DAY_TABLES
+        }),
+    }
+
+
+def _write(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_bundle(df, out_dir, since=competition.DEFAULT_SINCE, min_rounds=competition.DEFAULT_MIN_ROUNDS, incremental=False):
+    """Write the bundle to `out_dir`; returns the manifest, with "skipped" True if it was up to date."""
+    since = str(pd.Timestamp(since).date())
+    key = fingerprint(df, since, min_rounds)
+    manifest = read_manifest(out_dir)
+    if (incremental and manifest and manifest.get("fingerprint") == key
+            and all(os.path.exists(os.path.join(out_dir, name)) for name in manifest.get("files", []))):
+        return {**manifest, "skipped": True}
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = build(df, since, min_rounds)
+    for name, data in files.items():
+        _write(os.path.join(out_dir, name), data)
+    # Written last, so an interrupted run is redone by the next --incremental
+    manifest = {
+        "fingerprint": key,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "since": since,
+        "min_rounds": min_rounds,
+        "scores": len(df),
+        "files": sorted(files),
+    }
+    _write(os.path.join(out_dir, "manifest.json"), json.dumps(manifest, indent=1).encode("utf-8"))
+    return {**manifest, "skipped": False}
+
+
+def main():
+    import storage
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="directory for the bundle")
+    parser.add_argument("--since", default=competition.DEFAULT_SINCE, help="only rounds on or after this date, YYYY-MM-DD")
+    parser.add_argument("--min-rounds", type=int, default=competition.DEFAULT_MIN_ROUNDS)
+    parser.add_argument("--incremental", action="store_true", help="do nothing if the data and options are unchanged")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = storage.open_from_env().load_scores()
+    manifest = write_bundle(df, args.out, args.since, args.min_rounds, args.incremental)
+    seconds = time.perf_counter() - start
+    if manifest["skipped"]:
+        print(f"Unchanged since {manifest['generated']}; nothing written ({seconds:.1f}s)")
+    else:
+        print(f"Wrote {len(manifest['files'])} files for {manifest['scores']} scores to {args.out} ({seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,722 @@
+"""Storage backends for the competition data.
+
+Golf_App.py talks to a Storage object instead of calling Supabase directly.
+SupabaseStorage is the hosted database the club uses; SQLiteStorage serves
+the same tables from a local file such as Golf_comp.db, so the app and the
+benchmarks can run with no network. Pick one with the GOLF_STORAGE
+environment variable ("supabase" or "sqlite"). The backend only decides
+where the data lives: the app still asks for a Supabase login with SQLite,
+unless GOLF_SKIP_LOGIN=1 is set as well, which is meant for a trusted local
+machine only.
+
+Both backends return the same frames: load_scores() gives one flat row per
+score with SCORE_COLUMNS, in the compact SCORE_DTYPES schema and ordered by
+round date.
+
+SQLite schema changes are applied by an explicit migration, never by opening
+the file, so running the app doesn't rewrite a committed database:
+
+    python storage.py --migrate Golf_comp.db
+"""
+import argparse
+import contextvars
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from postgrest.exceptions import APIError
+
+# Values pulled out of DataFrames arrive as numpy scalars
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.int32, int)
+sqlite3.register_adapter(np.bool_, bool)
+
+log = logging.getLogger(__name__)
+
+_access_token = contextvars.ContextVar("access_token", default=None)
+_token_refresher = contextvars.ContextVar("token_refresher", default=None)
+
+SCORE_COLUMNS = ["round_id", "round_date", "course", "course_id", "player_id", "player", "score", "birdies", "eagles", "hat"]
+# Names repeat on every row, so they are categories; the counts fit small
+# ints (nullable, as the columns are nullable in the database).
+SCORE_DTYPES = {
+    "round_id": "int32",
+    "course": "category",
+    "course_id": "Int32",
+    "player_id": "int32",
+    "player": "category",
+    "score": "Int16",
+    "birdies": "Int8",
+    "eagles": "Int8",
+}
+
+
+def compact_scores(df):
+    """Give a scores frame the SCORE_DTYPES schema, round_date as datetime64, sorted by date.
+
+    round_date is parsed here, once per load, so pages can compare it with
+    dates directly. Safe to call on a frame that is already compact, e.g.
+    after concatenating two loads whose categories differ.
+    """
+    if df.empty:
+        df = pd.DataFrame(columns=SCORE_COLUMNS)
+    df = df[SCORE_COLUMNS].astype(SCORE_DTYPES)
+    df["round_date"] = pd.to_datetime(df["round_date"])
+    df["hat"] = df["hat"].fillna(False).astype(bool)
+    return df.sort_values(["round_date", "round_id", "player_id"], kind="stable", ignore_index=True)
+
+
+# Rounds behind the newest loaded one that a top-up reads again
+TOP_UP_OVERLAP = 20
+
+
+def top_up_scores(store, previous, overlap=TOP_UP_OVERLAP):
+    """`previous` (a compact scores frame) with the rounds saved since it was loaded.
+
+    Round ids are handed out when a save starts, not when it commits, so a
+    round that commits late can have a lower id than one already loaded.
+    The last `overlap` round ids are read again and replace their rows, so
+    such a round still turns up unless more than `overlap` rounds overtook it.
+    """
+    since = int(previous["round_id"].max()) - overlap
+    fresh = store.load_scores(since_round_id=since)
+    kept = previous[previous["round_id"] <= since]
+    return compact_scores(pd.concat([kept, fresh], ignore_index=True))
+
+
+ROUND_COLUMNS = ["round_id", "round_date", "course"]
+
+
+def rounds_frame(rows):
+    """Rounds index frame from (round_id, round_date, course) tuples."""
+    df = pd.DataFrame.from_records(rows, columns=ROUND_COLUMNS)
+    df["round_id"] = df["round_id"].astype("int32")
+    df["round_date"] = pd.to_datetime(df["round_date"])
+    return df
+
+
+def search_dates(search):
+    """[start, end) dates matched by a 2025, 2025-03 or 2025-03-14 search, else None."""
+    parts = search.strip().split("-")
+    if not 1 <= len(parts) <= 3 or len(parts[0]) != 4 or not all(p.isdigit() for p in parts):
+        return None
+    nums = [int(p) for p in parts]
+    try:
+        if len(nums) == 1:
+            start, end = date(nums[0], 1, 1), date(nums[0] + 1, 1, 1)
+        elif len(nums) == 2:
+            start = date(nums[0], nums[1], 1)
+            end = date(nums[0] + nums[1] // 12, nums[1] % 12 + 1, 1)
+        else:
+            start = date(*nums)
+            end = start + timedelta(days=1)
+    except ValueError:
+        return None
+    return str(start), str(end)
+
+
+class Storage:
+    name = "base"
+
+    # --- Players ---
+    def load_players(self):
+        raise NotImplementedError
+
+    def insert_player(self, name, full_name="", image_url=""):
+        raise NotImplementedError
+
+    def delete_player(self, player_id):
+        raise NotImplementedError
+
+    def update_player(self, player_id, name, full_name="", image_url=""):
+        raise NotImplementedError
+
+    # --- Courses ---
+    def load_courses(self):
+        raise NotImplementedError
+
+    def insert_course(self, name):
+        raise NotImplementedError
+
+    def delete_course(self, course_id):
+        raise NotImplementedError
+
+    # --- Rounds and scores ---
+    def load_scores(self, since_round_id=None):
+        """Flat scores frame, optionally only rounds newer than since_round_id."""
+        raise NotImplementedError
+
+    def load_rounds(self, limit=50, offset=0, search=None):
+        """One page of rounds, newest first: (frame of ROUND_COLUMNS, total matching).
+
+        search is a date prefix (see search_dates) or part of a course name.
+        """
+        raise NotImplementedError
+
+    def load_round_scores(self, round_id):
+        """Flat scores frame for a single round."""
+        raise NotImplementedError
+
+    def insert_round(self, round_date, course_id, scores):
+        """Insert a round and its scores, returning the new round_id.
+
+        scores maps player_id -> (score, birdies, eagles, hat); players with
+        no score are skipped.
+        """
+        round_ids = self.insert_rounds([(round_date, course_id, scores)])
+        if not round_ids or round_ids[0] is None:
+            raise RuntimeError("The database did not return an id for the new round")
+        return round_ids[0]
+
+    def insert_rounds(self, rounds):
+        """Insert (round_date, course_id, scores) rounds in one transaction.
+
+        Returns the new round_ids in the same order.
+        """
+        raise NotImplementedError
+
+    def update_round(self, round_id, course_id):
+        raise NotImplementedError
+
+    def update_score(self, round_id, player_id, score, birdies, eagles, hat):
+        raise NotImplementedError
+
+    def batch_update_scores(self, round_id, updates):
+        raise NotImplementedError
+
+
+def set_access_token(token, refresh=None):
+    """Use this session's Supabase access token for requests from this thread.
+
+    If a request is turned away because the token has expired, refresh(token)
+    is asked for a new one and the request is sent once more.
+    """
+    _access_token.set(token)
+    _token_refresher.set(refresh)
+
+
+def score_rows(round_id, scores):
+    rows = []
+    for player_id, (score, birdies, eagles, hat) in scores.items():
+        if score is not None:
+            rows.append({
+                "round_id": round_id,
+                "player_id": player_id,
+                "score": score,
+                "birdies": birdies,
+                "eagles": eagles,
+                "hat": hat,
+            })
+    return rows
+
+
+# --- Supabase ---
+SCORES_PAGE_SIZE = 1000
+INSERT_ROUNDS_FUNCTION = "insert_rounds_with_scores"
+# The scores_flat view (supabase_rpc.sql) serves SCORE_COLUMNS as plain columns
+FLAT_SCORES_VIEW = "scores_flat"
+FLAT_SCORES_SELECT = ", ".join(SCORE_COLUMNS)
+# PostgREST's "no such table or view" codes (PGRST205 from v12, 42P01 before)
+MISSING_RELATION = {"PGRST205", "42P01"}
+# PostgREST's codes for a rejected JWT (PGRST303 "JWT expired" from v12, PGRST301 before)
+EXPIRED_TOKEN = {"PGRST301", "PGRST303"}
+SCORES_SELECT = """
+    score,
+    birdies,
+    eagles,
+    hat,
+    players ( player_id, name ),
+    rounds ( round_id, round_date, courses ( course_id, name ) )
+"""
+
+
+def flat_scores_frame(rows):
+    """Frame of scores_flat rows, which already have SCORE_COLUMNS as keys."""
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame.from_records(rows, columns=SCORE_COLUMNS)
+
+
+def _flat_score_row(row):
+    player = row.get("players") or {}
+    rnd = row.get("rounds") or {}
+    course = rnd.get("courses") or {}
+    return (
+        rnd.get("round_id"), rnd.get("round_date"), course.get("name"), course.get("course_id"),
+        player.get("player_id"), player.get("name"),
+        row.get("score"), row.get("birdies"), row.get("eagles"), row.get("hat"),
+    )
+
+
+def flatten_scores(rows):
+    """Flatten the nested players(...)/rounds(courses(...)) embed into columns.
+
+    Only used until the scores_flat view exists. Each row is unpacked once
+    into a tuple and the frame is built from those records in one go. That
+    beats building each column separately and pd.json_normalize, both of
+    which walk the nested dicts more than once per row.
+    """
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame.from_records((_flat_score_row(r) for r in rows), columns=SCORE_COLUMNS)
+
+
+class SupabaseStorage(Storage):
+    name = "supabase"
+
+    def __init__(self, client):
+        self.client = client
+        # Cleared on the first "no such view" error, for databases without supabase_rpc.sql
+        self.flat_view = True
+
+    def _send(self, query, token):
+        # The client is shared by every session, so the caller's token goes on
+        # the request itself; without one we fall back to the anon key.
+        request = getattr(query, "request", query)
+        request.headers["Authorization"] = f"Bearer {token or self.client.supabase_key}"
+        return query.execute()
+
+    def _execute(self, query):
+        token = _access_token.get()
+        try:
+            return self._send(query, token)
+        except APIError as e:
+            refresh = _token_refresher.get()
+            if token is None or refresh is None or e.code not in EXPIRED_TOKEN:
+                raise
+            token = refresh(token)
+            if token is None:
+                raise
+            _access_token.set(token)
+            return self._send(query, token)
+
+    def load_players(self):
+        response = self._execute(self.client.table("players").select("player_id, name, full_name, image_url").order("name"))
+        return pd.DataFrame(response.data)
+
+    def insert_player(self, name, full_name="", image_url=""):
+        self._execute(self.client.table("players").insert({"name": name, "full_name": full_name, "image_url": image_url}))
+
+    def delete_player(self, player_id):
+        self._execute(self.client.table("players").delete().eq("player_id", player_id))
+
+    def update_player(self, player_id, name, full_name="", image_url=""):
+        self._execute(self.client.table("players").update({
+            "name": name,
+            "full_name": full_name,
+            "image_url": image_url
+        }).eq("player_id", player_id))
+
+    def load_courses(self):
+        response = self._execute(self.client.table("courses").select("course_id, name").order("name"))
+        return pd.DataFrame(response.data)
+
+    def insert_course(self, name):
+        self._execute(self.client.table("courses").insert({"name": name}))
+
+    def delete_course(self, course_id):
+        self._execute(self.client.table("courses").delete().eq("course_id", course_id))
+
+    def _select_scores(self, build):
+        """Execute build(table, columns) against scores_flat, or the nested embed without it.
+
+        Returns the response and the function that turns its rows into a frame.
+        """
+        if self.flat_view:
+            try:
+                return self._execute(build(FLAT_SCORES_VIEW, FLAT_SCORES_SELECT)), flat_scores_frame
+            except APIError as e:
+                if e.code not in MISSING_RELATION:
+                    raise
+                log.warning("No %s view; flattening nested scores instead (run supabase_rpc.sql)", FLAT_SCORES_VIEW)
+                self.flat_view = False
+        return self._execute(build("scores", SCORES_SELECT)), flatten_scores
+
+    def load_scores(self, since_round_id=None):
+        """Page through the scores with range requests.
+
+        PostgREST caps a response at its max-rows setting (1000 by default), so
+        a single select silently drops rows. The first page asks for an exact
+        count and we keep requesting ranges until we have that many rows. Each
+        page is turned into a frame as it arrives and the chunks are joined at
+        the end.
+        """
+        chunks = []
+        start = 0
+        total = None
+
+        while total is None or start < total:
+            def build(table, columns):
+                query = self.client.table(table).select(columns, count="exact" if total is None else None)
+                if since_round_id is not None:
+                    query = query.gt("round_id", since_round_id)
+                return query.order("round_id").order("player_id").range(start, start + SCORES_PAGE_SIZE - 1)
+
+            response, to_frame = self._select_scores(build)
+            if total is None:
+                # Without a count, keep paging until an empty page comes back
+                total = response.count if response.count is not None else float("inf")
+            rows = response.data or []
+            if not rows:
+                break
+            chunks.append(to_frame(rows))
+            start += len(rows)
+
+        if not chunks:
+            return compact_scores(pd.DataFrame())
+        return compact_scores(pd.concat(chunks, ignore_index=True))
+
+    def load_rounds(self, limit=50, offset=0, search=None):
+        # !inner so a course-name filter drops non-matching rounds instead of
+        # returning them with an empty embed
+        query = self.client.table("rounds").select("round_id, round_date, courses!inner(name)", count="exact")
+        if search:
+            dates = search_dates(search)
+            if dates:
+                query = query.gte("round_date", dates[0]).lt("round_date", dates[1])
+            else:
+                query = query.ilike("courses.name", f"%{search.strip()}%")
+        response = self._execute(
+            query.order("round_date", desc=True).order("round_id", desc=True).range(offset, offset + limit - 1)
+        )
+        rows = [(r["round_id"], r["round_date"], (r.get("courses") or {}).get("name")) for r in response.data or []]
+        total = response.count if response.count is not None else offset + len(rows)
+        return rounds_frame(rows), total
+
+    def load_round_scores(self, round_id):
+        response, to_frame = self._select_scores(
+            lambda table, columns: self.client.table(table).select(columns).eq("round_id", round_id).order("player_id")
+        )
+        return compact_scores(to_frame(response.data or []))
+
+    def insert_rounds(self, rounds):
+        """One call to the insert_rounds_with_scores function (supabase_rpc.sql).
+
+        The function runs in a single transaction, so a failed score insert
+        can't leave an orphan round behind.
+        """
+        payload = [
+            {
+                "round_date": str(round_date),
+                "course_id": course_id,
+                "scores": [{k: v for k, v in row.items() if k != "round_id"} for row in score_rows(None, scores)],
+            }
+            for round_date, course_id, scores in rounds
+        ]
+        try:
+            response = self._execute(self.client.rpc(INSERT_ROUNDS_FUNCTION, {"p_rounds": payload}))
+        except APIError as e:
+            # PGRST202: the function hasn't been created on this database yet
+            if e.code != "PGRST202":
+                raise
+            log.warning(
+                "No %s function; inserting %d round(s) and their scores in separate requests, "
+                "which is not atomic (run supabase_rpc.sql)", INSERT_ROUNDS_FUNCTION, len(rounds),
+            )
+            return [self._insert_round_two_step(*r) for r in rounds]
+        round_ids = [row["new_round_id"] for row in response.data or []]
+        if len(round_ids) != len(rounds):
+            raise RuntimeError(f"{INSERT_ROUNDS_FUNCTION} returned {len(round_ids)} round ids for {len(rounds)} rounds")
+        return round_ids
+
+    def _insert_round_two_step(self, round_date, course_id, scores):
+        # Not atomic; only used until supabase_rpc.sql has been run
+        round_resp = self._execute(self.client.table("rounds").insert(
+            {"round_date": str(round_date), "course_id": course_id}
+        ))
+
+        if not round_resp.data:
+            raise RuntimeError("Supabase did not return the inserted round")
+        round_id = round_resp.data[0]["round_id"]
+
+        rows = score_rows(round_id, scores)
+        if rows:
+            self._execute(self.client.table("scores").insert(rows))
+        return round_id
+
+    def update_round(self, round_id, course_id):
+        self._execute(self.client.table("rounds").update({
+            "course_id": course_id
+        }).eq("round_id", round_id))
+
+    def update_score(self, round_id, player_id, score, birdies, eagles, hat):
+        self._execute(self.client.table("scores").update({
+            "score": score,
+            "birdies": birdies,
+            "eagles": eagles,
+            "hat": hat
+        }).eq("round_id", round_id).eq("player_id", player_id))
+
+    def batch_update_scores(self, round_id, updates):
+        self._execute(self.client.table("scores").upsert(updates))
+
+
+# --- SQLite ---
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE,
+    full_name TEXT,
+    image_url TEXT
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    round_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round_date DATE NOT NULL,
+    course_id INTEGER NOT NULL,
+    FOREIGN KEY (course_id) REFERENCES courses(course_id)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    score_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    score INTEGER, birdies integer, eagles integer, hat BOOLEAN,
+    FOREIGN KEY (round_id) REFERENCES rounds(round_id),
+    FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_round_player ON scores (round_id, player_id);
+CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player_id);
+CREATE INDEX IF NOT EXISTS idx_rounds_date ON rounds (round_date);
+"""
+
+# Older copies of Golf_comp.db predate these columns
+SQLITE_ADDED_COLUMNS = {"players": {"full_name": "TEXT", "image_url": "TEXT"}}
+# Stored in PRAGMA user_version; bump it with any change to the two above
+SQLITE_SCHEMA_VERSION = 1
+
+SQLITE_SCORES_SELECT = """
+SELECT r.round_id, r.round_date, c.name AS course, c.course_id,
+       p.player_id, p.name AS player, s.score, s.birdies, s.eagles, s.hat
+FROM scores s
+LEFT JOIN players p ON p.player_id = s.player_id
+LEFT JOIN rounds r ON r.round_id = s.round_id
+LEFT JOIN courses c ON c.course_id = r.course_id
+"""
+SQLITE_SCORES_QUERY = SQLITE_SCORES_SELECT + "WHERE s.round_id > ? ORDER BY s.round_id, s.player_id"
+SQLITE_ROUND_SCORES_QUERY = SQLITE_SCORES_SELECT + "WHERE s.round_id = ? ORDER BY s.player_id"
+
+SQLITE_ROUNDS_FROM = "FROM rounds r LEFT JOIN courses c ON c.course_id = r.course_id"
+# Fixed filter clauses, so each variant is still one cached prepared statement
+SQLITE_ROUNDS_FILTERS = {
+    None: ("", lambda search: ()),
+    "dates": ("WHERE r.round_date >= ? AND r.round_date < ?", lambda search: search_dates(search)),
+    "course": ("WHERE c.name LIKE ?", lambda search: (f"%{search.strip()}%",)),
+}
+
+
+class SQLiteStorage(Storage):
+    """Local SQLite database with the same tables as Supabase.
+
+    One connection is shared by every session, guarded by a lock. Queries use
+    fixed SQL with ? parameters, so sqlite3 reuses its prepared statements,
+    and the joins in load_scores run off the indexes created in
+    SQLITE_SCHEMA.
+
+    Opening a database never changes it. A new, empty file gets the schema
+    straight away; an existing one is brought up to date only by
+    migrate_sqlite() (python storage.py --migrate PATH). Until then it is
+    used as it is: reads work, just without the indexes, and writing player
+    details that need the newer columns raises.
+    """
+    name = "sqlite"
+
+    def __init__(self, path="Golf_comp.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            if not self.conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                # Nothing to preserve in an empty file
+                _migrate(self.conn)
+            self.schema_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            self.player_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(players)")}
+        if self.schema_version < SQLITE_SCHEMA_VERSION:
+            log.warning(
+                "%s is at schema version %d of %d; run `python storage.py --migrate %s` to update it",
+                path, self.schema_version, SQLITE_SCHEMA_VERSION, path,
+            )
+
+    def _player_column(self, column):
+        return column if column in self.player_columns else f"NULL AS {column}"
+
+    def _require_player_columns(self):
+        missing = set(SQLITE_ADDED_COLUMNS["players"]) - self.player_columns
+        if missing:
+            raise RuntimeError(
+                f"{self.path} has no players.{', players.'.join(sorted(missing))} yet; "
+                f"run `python storage.py --migrate {self.path}` first"
+            )
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def _write(self, sql, params=()):
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params)
+
+    def load_players(self):
+        return self._query(
+            f"SELECT player_id, name, {self._player_column('full_name')}, {self._player_column('image_url')} "
+            "FROM players ORDER BY name"
+        )
+
+    def insert_player(self, name, full_name="", image_url=""):
+        self._require_player_columns()
+        self._write("INSERT INTO players (name, full_name, image_url) VALUES (?, ?, ?)", (name, full_name, image_url))
+
+    def delete_player(self, player_id):
+        self._write("DELETE FROM players WHERE player_id = ?", (player_id,))
+
+    def update_player(self, player_id, name, full_name="", image_url=""):
+        self._require_player_columns()
+        self._write(
+            "UPDATE players SET name = ?, full_name = ?, image_url = ? WHERE player_id = ?",
+            (name, full_name, image_url, player_id),
+        )
+
+    def load_courses(self):
+        return self._query("SELECT course_id, name FROM courses ORDER BY name")
+
+    def insert_course(self, name):
+        self._write("INSERT INTO courses (name) VALUES (?)", (name,))
+
+    def delete_course(self, course_id):
+        self._write("DELETE FROM courses WHERE course_id = ?", (course_id,))
+
+    def load_scores(self, since_round_id=None):
+        return compact_scores(self._query(SQLITE_SCORES_QUERY, (since_round_id if since_round_id is not None else -1,)))
+
+    def load_rounds(self, limit=50, offset=0, search=None):
+        kind = None if not search else "dates" if search_dates(search) else "course"
+        where, params = SQLITE_ROUNDS_FILTERS[kind]
+        params = params(search)
+        with self.lock:
+            total = self.conn.execute(f"SELECT COUNT(*) {SQLITE_ROUNDS_FROM} {where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT r.round_id, r.round_date, c.name {SQLITE_ROUNDS_FROM} {where} "
+                "ORDER BY r.round_date DESC, r.round_id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return rounds_frame(rows), total
+
+    def load_round_scores(self, round_id):
+        return compact_scores(self._query(SQLITE_ROUND_SCORES_QUERY, (round_id,)))
+
+    def insert_rounds(self, rounds):
+        round_ids = []
+        with self.lock, self.conn:
+            for round_date, course_id, scores in rounds:
+                cur = self.conn.execute(
+                    "INSERT INTO rounds (round_date, course_id) VALUES (?, ?)", (str(round_date), course_id)
+                )
+                round_id = cur.lastrowid
+                self.conn.executemany(
+                    "INSERT INTO scores (round_id, player_id, score, birdies, eagles, hat) "
+                    "VALUES (:round_id, :player_id, :score, :birdies, :eagles, :hat)",
+                    score_rows(round_id, scores),
+                )
+                round_ids.append(round_id)
+        return round_ids
+
+    def update_round(self, round_id, course_id):
+        self._write("UPDATE rounds SET course_id = ? WHERE round_id = ?", (course_id, round_id))
+
+    def update_score(self, round_id, player_id, score, birdies, eagles, hat):
+        self._write(
+            "UPDATE scores SET score = ?, birdies = ?, eagles = ?, hat = ? WHERE round_id = ? AND player_id = ?",
+            (score, birdies, eagles, hat, round_id, player_id),
+        )
+
+    def batch_update_scores(self, round_id, updates):
+        with self.lock, self.conn:
+            for row in updates:
+                cur = self.conn.execute(
+                    "UPDATE scores SET score = :score, birdies = :birdies, eagles = :eagles, hat = :hat "
+                    "WHERE round_id = :round_id AND player_id = :player_id",
+                    row,
+                )
+                if cur.rowcount == 0:
+                    self.conn.execute(
+                        "INSERT INTO scores (round_id, player_id, score, birdies, eagles, hat) "
+                        "VALUES (:round_id, :player_id, :score, :birdies, :eagles, :hat)",
+                        row,
+                    )
+
+
+def _migrate(conn):
+    conn.executescript(SQLITE_SCHEMA)
+    for table, columns in SQLITE_ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, kind in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+    conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+    conn.commit()
+    # Persistent, and lets readers carry on while the app writes
+    conn.execute("PRAGMA journal_mode=WAL")
+
+
+def migrate_sqlite(path):
+    """Bring the SQLite file at `path` up to SQLITE_SCHEMA_VERSION; returns (old, new) versions."""
+    conn = sqlite3.connect(path)
+    try:
+        old = conn.execute("PRAGMA user_version").fetchone()[0]
+        if old < SQLITE_SCHEMA_VERSION:
+            _migrate(conn)
+        return old, max(old, SQLITE_SCHEMA_VERSION)
+    finally:
+        conn.close()
+
+
+def storage_backend():
+    return os.environ.get("GOLF_STORAGE", "supabase").lower()
+
+
+def open_storage(backend=None, client=None, sqlite_path=None):
+    """Build the configured backend. Supabase needs an existing client."""
+    backend = backend or storage_backend()
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path or os.environ.get("GOLF_SQLITE_PATH", "Golf_comp.db"))
+    if backend == "supabase":
+        return SupabaseStorage(client)
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+def open_from_env():
+    """Backend for scripts run outside the app, configured from the environment.
+
+    Supabase needs SUPABASE_URL and SUPABASE_KEY to be set.
+    """
+    backend = storage_backend()
+    client = None
+    if backend == "supabase":
+        import supabase_pool
+        client = supabase_pool.create_pooled_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    return open_storage(backend, client=client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--migrate", metavar="PATH", nargs="?", const="",
+                        help="update a SQLite database's schema (default: GOLF_SQLITE_PATH or Golf_comp.db)")
+    args = parser.parse_args()
+    if args.migrate is None:
+        parser.print_help()
+        return
+    path = args.migrate or os.environ.get("GOLF_SQLITE_PATH", "Golf_comp.db")
+    old, new = migrate_sqlite(path)
+    print(f"{path}: schema version {old} -> {new}" if new != old else f"{path}: already at schema version {new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Summary leaderboard statistics.
+
+Every column of the Summary table is computed with grouped passes over the
+whole scores frame, instead of filtering the frame once per player. The
+result matches what the old per-player loop in Golf_App.py produced, before
+the hat icon and styling are applied.
+"""
+import numpy as np
+import pandas as pd
+
+SUMMARY_COLUMNS = [
+    "Player", "Times Played", "Last Score", "Average", "Avg Rank",
+    "Best Round", "Best Round Rank", "Worst Round", "Worst Round Rank",
+    "Avg best 6", "Rank Best 6", "Avg worst 6", "Rank Worst",
+    "Total Birdies", "Total Eagles", "Total Hats"
+]
+RANK_COLUMNS = ["Avg Rank", "Best Round Rank", "Worst Round Rank", "Rank Best 6", "Rank Worst"]
+COUNT_COLUMNS = ["Times Played", "Best Round", "Worst Round", "Total Birdies", "Total Eagles", "Total Hats"]
+
+
+def filter_min_rounds(df, min_rounds):
+    """Keep only players with at least `min_rounds` distinct round dates."""
+    rounds_played = df.groupby("player", observed=True)["round_date"].transform("nunique")
+    return df[rounds_played >= min_rounds]
+
+
+def _mean_of_top(df, n, largest):
+    """Per-player mean of the n highest (or lowest) scores."""
+    ordered = df[["player", "score"]].sort_values(
+        ["player", "score"], ascending=[True, not largest], kind="stable"
+    )
+    top = ordered[ordered.groupby("player", observed=True).cumcount() < n]
+    return top.groupby("player", observed=True)["score"].mean()
+
+
+def trend_arrows(last, prev):
+    # As floats, a missing previous score is NaN rather than <NA>, which np.select can't take
+    last, prev = last.astype("float64"), prev.astype("float64")
+    return pd.Series(
+        np.select([prev.isna(), last > prev, last < prev], ["", "▲", "▼"], default="→"),
+        index=last.index,
+    )
+
+
+def player_columns(df):
+    """Unranked per-player columns, indexed by player name in sorted order."""
+    ordered = df.sort_values(["player", "round_date"], kind="stable")
+    grouped = ordered.groupby("player", observed=True)
+    scores = grouped["score"]
+
+    # Last score + trend against the round before it
+    from_end = grouped.cumcount(ascending=False)
+    last = ordered.loc[from_end == 0].set_index("player")["score"]
+    prev = ordered.loc[from_end == 1].set_index("player")["score"].reindex(last.index)
+    last_score = last.astype(int).astype(str) + " " + trend_arrows(last, prev)
+
+    times_played = grouped.size()
+    avg_score = scores.mean()
+    enough = times_played >= 6
+
+    summary = pd.DataFrame({
+        "Times Played": times_played,
+        "Last Score": last_score,
+        "Average": avg_score,
+        "Best Round": scores.max(),
+        "Worst Round": scores.min(),
+        "Avg best 6": _mean_of_top(ordered, 6, largest=True).where(enough, avg_score),
+        "Avg worst 6": _mean_of_top(ordered, 6, largest=False).where(enough, avg_score),
+        "Total Birdies": grouped["birdies"].sum(),
+        "Total Eagles": grouped["eagles"].sum(),
+        "Total Hats": grouped["hat"].sum(),
+    })
+    summary.index.name = None
+    return summary
+
+
+def rank_summary(summary_df):
+    """Add rank columns, cast counts and order the table best average first."""
+    summary_df = summary_df.copy()
+    summary_df["Avg Rank"] = summary_df["Average"].rank(ascending=False, method="min")
+    summary_df["Best Round Rank"] = summary_df["Best Round"].rank(ascending=False, method="min")
+    summary_df["Worst Round Rank"] = summary_df["Worst Round"].rank(ascending=True, method="min")
+    summary_df["Rank Best 6"] = summary_df["Avg best 6"].rank(ascending=False, method="min")
+    summary_df["Rank Worst"] = summary_df["Avg worst 6"].rank(ascending=True, method="min")
+
+    for col in RANK_COLUMNS + COUNT_COLUMNS:
+        summary_df[col] = summary_df[col].astype("Int64")
+
+    summary_df = summary_df.reset_index().rename(columns={"index": "Player"})
+    summary_df = summary_df.sort_values("Avg Rank", ascending=True).reset_index(drop=True)
+    return summary_df[SUMMARY_COLUMNS]
+
+
+def compute_summary(df):
+    """Summary table for an already date- and eligibility-filtered scores frame."""
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return rank_summary(player_columns(df))
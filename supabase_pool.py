@@ -0,0 +1,132 @@
+"""One Supabase client per process, on a pooled keep-alive HTTP connection.
+
+create_pooled_client() hands the Supabase client our own httpx.Client, so
+PostgREST and auth share one connection pool. That pool survives the client
+rebuilding its PostgREST instance after a login or token refresh. The client
+holds no per-user state that matters: storage.SupabaseStorage sets each
+session's access token on every request instead.
+
+A browser session's login is a SessionAuth, kept in st.session_state. As
+the client never refreshes tokens itself (auto_refresh_token=False), the app
+calls current_token() at the start of each rerun, which renews the access
+token with the refresh token once it is about to expire. storage retries a
+request rejected for an expired token through refresh().
+
+Requests and newly opened connections are counted through httpx hooks, so
+diagnostics() can show how often a request reused a connection.
+"""
+import logging
+import threading
+import time
+
+import httpx
+from supabase import ClientOptions, create_client
+
+import profiling
+
+log = logging.getLogger(__name__)
+
+# Renew an access token this many seconds before it expires
+REFRESH_MARGIN = 60
+
+_lock = threading.Lock()
+_stats = {"requests": 0, "connections_opened": 0}
+_http_clients = []
+
+
+def _trace(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        with _lock:
+            _stats["connections_opened"] += 1
+
+
+def _on_request(request):
+    with _lock:
+        _stats["requests"] += 1
+    request.extensions["trace"] = _trace
+
+
+def _on_response(response):
+    # Only pay for reading the body early when the profiling panel is on
+    if profiling.enabled():
+        response.read()
+        profiling.add_bytes(response.num_bytes_downloaded)
+
+
+def create_pooled_client(url, key):
+    http_client = httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+    _http_clients.append(http_client)
+    options = ClientOptions(httpx_client=http_client, persist_session=False, auto_refresh_token=False)
+    return create_client(url, key, options)
+
+
+def _pooled_connections(http_client):
+    # httpx doesn't expose its pool publicly; report nothing rather than fail
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    return len(getattr(pool, "connections", []) or [])
+
+
+def diagnostics():
+    with _lock:
+        stats = dict(_stats)
+    requests = stats["requests"]
+    stats["connection_reuse"] = round(1 - stats["connections_opened"] / requests, 3) if requests else None
+    stats["clients"] = len(_http_clients)
+    stats["pooled_connections"] = sum(_pooled_connections(c) for c in _http_clients)
+    return stats
+
+
+class SessionAuth:
+    """One browser session's Supabase tokens.
+
+    refresh() can be called from loader threads, so it takes a lock and
+    touches no Streamlit state.
+    """
+
+    def __init__(self, client, session):
+        self.client = client
+        self.lock = threading.Lock()
+        self._use(session)
+
+    def _use(self, session):
+        self.access_token = session.access_token
+        self.refresh_token = session.refresh_token
+        # Epoch seconds; a session without one is treated as already expiring
+        self.expires_at = session.expires_at or 0
+
+    def expiring(self):
+        return time.time() >= self.expires_at - REFRESH_MARGIN
+
+    def refresh(self, stale_token=None):
+        """Trade the refresh token for a new session; the new access token, or None if refused.
+
+        With `stale_token`, a token another thread has already renewed is
+        returned as is rather than refreshed twice.
+        """
+        with self.lock:
+            if stale_token is not None and stale_token != self.access_token:
+                return self.access_token
+            if self.refresh_token is None:
+                return None
+            try:
+                response = self.client.auth.refresh_session(refresh_token=self.refresh_token)
+            except Exception as e:
+                log.warning("Couldn't refresh the Supabase session: %s", e)
+                response = None
+            if response is None or response.session is None:
+                self.access_token = self.refresh_token = None
+                return None
+            self._use(response.session)
+            return self.access_token
+
+    def current_token(self):
+        """The access token for this rerun, renewed first if it is about to expire."""
+        if self.access_token is not None and self.expiring():
+            return self.refresh(self.access_token)
+        return self.access_token
@@ -0,0 +1,57 @@
+-- Database functions and views the app calls through Supabase.
+-- Run once in the Supabase SQL editor (safe to re-run).
+
+-- Insert rounds and their scores in one transaction, in a single request.
+--
+-- p_rounds is a JSON array in input order:
+--   [{"round_date": "2026-01-03", "course_id": 1,
+--     "scores": [{"player_id": 1, "score": 36, "birdies": 1, "eagles": 0, "hat": false}, ...]},
+--    ...]
+-- Returns one row per round with the new round_id, in the same order.
+create or replace function insert_rounds_with_scores(p_rounds jsonb)
+returns table (new_round_id integer)
+language plpgsql
+as $$
+declare
+    r jsonb;
+begin
+    for r in
+        select e.value
+        from jsonb_array_elements(p_rounds) with ordinality as e(value, idx)
+        order by e.idx
+    loop
+        insert into rounds (round_date, course_id)
+        values ((r->>'round_date')::date, (r->>'course_id')::integer)
+        returning rounds.round_id into new_round_id;
+
+        insert into scores (round_id, player_id, score, birdies, eagles, hat)
+        select new_round_id, s.player_id, s.score, s.birdies, s.eagles, s.hat
+        from jsonb_to_recordset(coalesce(r->'scores', '[]'::jsonb))
+            as s(player_id integer, score integer, birdies integer, eagles integer, hat boolean);
+
+        return next;
+    end loop;
+end;
+$$;
+
+-- One flat row per score, so load_scores() reads plain columns instead of
+-- flattening the nested players(...)/rounds(courses(...)) embed row by row.
+-- security_invoker keeps the scores tables' row-level security in force.
+create or replace view scores_flat
+with (security_invoker = on)
+as
+select
+    s.round_id,
+    r.round_date,
+    c.name as course,
+    c.course_id,
+    s.player_id,
+    p.name as player,
+    s.score,
+    s.birdies,
+    s.eagles,
+    s.hat
+from scores s
+left join players p on p.player_id = s.player_id
+left join rounds r on r.round_id = s.round_id
+left join courses c on c.course_id = r.course_id;
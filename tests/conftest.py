@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import flat_scores, synthetic_tables  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def scores():
+    """A compact scores frame, as load_scores() returns it: 40 players, 2,000 scores."""
+    return flat_scores(synthetic_tables(n_players=40, n_scores=2_000, players_per_round=8, years=2))
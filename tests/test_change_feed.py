@@ -0,0 +1,211 @@
+import threading
+
+import pytest
+
+import change_feed
+import data_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    data_cache.clear()
+    yield
+    data_cache.clear()
+
+
+def test_publish_drops_only_loaders_of_the_touched_tables():
+    calls = {"scores": 0, "courses": 0}
+
+    @data_cache.cached("scores")
+    def load_scores():
+        calls["scores"] += 1
+        return calls["scores"]
+
+    @data_cache.cached("courses")
+    def load_courses():
+        calls["courses"] += 1
+        return calls["courses"]
+
+    assert (load_scores(), load_courses()) == (1, 1)
+    assert (load_scores(), load_courses()) == (1, 1)
+
+    change_feed.publish("scores")
+    assert (load_scores(), load_courses()) == (2, 1)
+
+
+def test_new_players_and_courses_keep_score_views():
+    calls = []
+
+    @data_cache.cached(*change_feed.SCORE_TABLES)
+    def load_scores():
+        calls.append(1)
+        return len(calls)
+
+    assert load_scores() == 1
+    change_feed.publish("players")
+    change_feed.publish("courses")
+    assert load_scores() == 1
+    # A rename is published with "scores", as the names are in the score rows
+    change_feed.publish("players", "scores")
+    assert load_scores() == 2
+
+
+def test_publish_bumps_table_versions():
+    before = data_cache.table_versions("rounds", "scores", "players")
+    version = data_cache.data_version()
+    change_feed.publish("rounds", "scores")
+    after = data_cache.table_versions("rounds", "scores", "players")
+    assert after == (before[0] + 1, before[1] + 1, before[2])
+    assert data_cache.data_version() == version + 1
+
+
+def test_append_only_publish_keeps_snapshots():
+    token = data_cache.snapshot_token("scores")
+    data_cache.store_snapshot("test", "value", ["scores"], token)
+
+    change_feed.publish("scores", append_only=True)
+    assert data_cache.snapshot("test") == "value"
+
+    change_feed.publish("scores")
+    assert data_cache.snapshot("test") is None
+
+
+def test_changes_since():
+    seq = change_feed.latest()
+    first = change_feed.publish("rounds", "scores", append_only=True)
+    second = change_feed.publish("players")
+
+    assert change_feed.latest() == second.seq == first.seq + 1 == seq + 2
+    assert change_feed.changes_since(seq) == [first, second]
+    assert change_feed.changes_since(first.seq) == [second]
+    assert change_feed.changes_since(second.seq) == []
+    assert first.tables == ("rounds", "scores")
+    assert first.append_only and not second.append_only
+    assert first.origin == "app"
+
+
+def test_wait_times_out_without_a_change():
+    assert change_feed.wait(change_feed.latest(), timeout=0.05) == []
+
+
+def test_wait_wakes_on_publish():
+    seq = change_feed.latest()
+    timer = threading.Timer(0.05, change_feed.publish, args=("courses",))
+    timer.start()
+    try:
+        changes = change_feed.wait(seq, timeout=5)
+    finally:
+        timer.join()
+    assert [c.tables for c in changes] == [("courses",)]
+
+
+def test_wait_returns_at_once_for_a_missed_change():
+    seq = change_feed.latest()
+    change = change_feed.publish("players")
+    assert change_feed.wait(seq, timeout=0) == [change]
+
+
+def test_subscribe_and_unsubscribe():
+    seen = []
+    change_feed.subscribe("test", seen.append)
+    try:
+        first = change_feed.publish("scores")
+        assert seen == [first]
+
+        # The same name replaces the earlier callback
+        replaced = []
+        change_feed.subscribe("test", replaced.append)
+        second = change_feed.publish("scores")
+        assert seen == [first]
+        assert replaced == [second]
+    finally:
+        change_feed.unsubscribe("test")
+
+    change_feed.publish("scores")
+    assert len(replaced) == 1
+    change_feed.unsubscribe("test")  # unsubscribing twice is fine
+
+
+def test_failing_listener_does_not_stop_others():
+    seen = []
+
+    def broken(change):
+        raise RuntimeError("listener bug")
+
+    change_feed.subscribe("broken", broken)
+    change_feed.subscribe("working", seen.append)
+    try:
+        change = change_feed.publish("rounds")
+    finally:
+        change_feed.unsubscribe("broken")
+        change_feed.unsubscribe("working")
+    assert seen == [change]
+
+
+def test_local_stream_publishes_a_burst_as_one_change():
+    stream = change_feed.LocalStream().start()
+    try:
+        seq = change_feed.latest()
+        for table in ["players", "scores", "rounds", "scores", "not_a_table"]:
+            stream.emit(table)
+        changes = change_feed.wait(seq, timeout=5)
+    finally:
+        stream.stop()
+
+    assert len(changes) == 1
+    # In TABLES order, unknown tables dropped
+    assert changes[0].tables == ("scores", "rounds", "players")
+    assert changes[0].origin == "local"
+    assert not changes[0].append_only
+    assert stream.published == 1
+
+
+def test_local_stream_invalidates_cached_loaders():
+    calls = []
+
+    @data_cache.cached("courses")
+    def load_courses():
+        calls.append(1)
+        return len(calls)
+
+    stream = change_feed.LocalStream().start()
+    try:
+        assert load_courses() == 1
+        seq = change_feed.latest()
+        stream.emit("courses", "UPDATE")
+        assert change_feed.wait(seq, timeout=5)
+        assert load_courses() == 2
+    finally:
+        stream.stop()
+
+
+@pytest.mark.parametrize("event, tables", [
+    ("INSERT", ("players",)),
+    ("UPDATE", ("scores", "players")),
+    ("DELETE", ("scores", "players")),
+])
+def test_stream_renames_and_removals_touch_scores(event, tables):
+    stream = change_feed.LocalStream().start()
+    try:
+        seq = change_feed.latest()
+        stream.emit("players", event)
+        changes = change_feed.wait(seq, timeout=5)
+    finally:
+        stream.stop()
+    assert changes[0].tables == tables
+
+
+def test_open_stream(monkeypatch):
+    monkeypatch.delenv("GOLF_CHANGE_STREAM", raising=False)
+    assert change_feed.open_stream() is None
+
+    monkeypatch.setenv("GOLF_CHANGE_STREAM", "local")
+    stream = change_feed.open_stream()
+    try:
+        assert isinstance(stream, change_feed.LocalStream)
+    finally:
+        stream.stop()
+
+    monkeypatch.setenv("GOLF_CHANGE_STREAM", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        change_feed.open_stream()
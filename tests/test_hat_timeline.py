@@ -0,0 +1,82 @@
+from datetime import date
+
+import pandas as pd
+
+from hat_timeline import HatTimeline
+from storage import compact_scores
+
+
+def assert_same_timeline(timeline, expected):
+    assert timeline.reigns == expected.reigns
+    assert timeline.max_round_id == expected.max_round_id
+
+
+def test_build_invariants(scores):
+    timeline = HatTimeline.build(scores)
+    players = [r["player"] for r in timeline.reigns]
+    assert all(a != b for a, b in zip(players, players[1:]))
+    assert sum(r["hats"] for r in timeline.reigns) == int(scores["hat"].sum())
+    assert timeline.max_round_id == int(scores["round_id"].max())
+    assert timeline.current is timeline.reigns[-1]
+
+
+def test_extended_matches_build(scores):
+    round_ids = sorted(scores["round_id"].unique())
+    timeline = HatTimeline.build(scores[scores["round_id"] <= round_ids[len(round_ids) // 2]])
+    # Fold the rest in a few rounds at a time, as each new round bumps the data version
+    for cut in round_ids[len(round_ids) // 2 + 7::7] + [round_ids[-1]]:
+        timeline = timeline.extended(scores[scores["round_id"] <= cut])
+    assert_same_timeline(timeline, HatTimeline.build(scores))
+
+
+def test_extended_without_new_rounds_is_unchanged(scores):
+    timeline = HatTimeline.build(scores)
+    assert timeline.extended(scores) is timeline
+
+
+def test_extended_leaves_the_earlier_timeline_alone(scores):
+    earlier = scores[scores["round_id"] < scores["round_id"].max()]
+    timeline = HatTimeline.build(earlier)
+    before = [dict(r) for r in timeline.reigns]
+    timeline.extended(scores)
+    assert timeline.reigns == before
+
+
+def test_backdated_round_rebuilds(scores):
+    middle = scores[scores["round_id"] == scores["round_id"].iloc[len(scores) // 2]]
+    # The round's lowest scorer takes the hat, so the backdated round changes hands
+    new = middle.assign(round_id=int(scores["round_id"].max()) + 1, hat=False)
+    new.loc[new["score"].idxmin(), "hat"] = True
+    full = compact_scores(pd.concat([scores, new]))
+
+    timeline = HatTimeline.build(scores).extended(full)
+    assert_same_timeline(timeline, HatTimeline.build(full))
+
+
+def test_round_that_committed_late_rebuilds(scores):
+    round_ids = sorted(scores["round_id"].unique())
+    hat_rounds = scores.loc[scores["hat"].astype(bool), "round_id"]
+    late = int(hat_rounds[hat_rounds < round_ids[-1]].iloc[-1])
+    # Built before the late round's hat row was in
+    timeline = HatTimeline.build(scores[scores["round_id"] != late])
+    assert_same_timeline(timeline.extended(scores), HatTimeline.build(scores))
+
+
+def test_holder_respects_since_and_eligible(scores):
+    timeline = HatTimeline.build(scores)
+    last, previous = timeline.reigns[-1], timeline.reigns[-2]
+    assert timeline.holder() == last["player"]
+    assert timeline.holder(eligible={previous["player"]}) == previous["player"]
+    assert timeline.holder(since=pd.Timestamp(last["last_hat"]) + pd.Timedelta(days=1)) is None
+    assert timeline.holder(eligible=set()) is None
+
+
+def test_table_runs_reigns_end_to_end(scores):
+    timeline = HatTimeline.build(scores)
+    today = date(2030, 1, 1)
+    table = timeline.table(today)
+    assert len(table) == len(timeline.reigns)
+    assert pd.isna(table["To"].iloc[0])
+    assert (table["To"].iloc[1:].to_numpy() == table["From"].iloc[:-1].to_numpy()).all()
+    assert table["Days"].sum() == (today - timeline.reigns[0]["start"]).days
+    assert timeline.days_held(today)["Hats"].sum() == int(scores["hat"].sum())
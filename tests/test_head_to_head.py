@@ -0,0 +1,82 @@
+from collections import defaultdict
+from itertools import permutations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import head_to_head
+
+
+def pairwise(df):
+    """Head-to-head totals the slow way: every ordered pair in every round."""
+    totals = defaultdict(lambda: [0, 0, 0, 0.0])
+    for _, rows in df.dropna(subset=["score"]).groupby("round_id"):
+        for (a, sa), (b, sb) in permutations(zip(rows["player"].astype(str), rows["score"].astype(float)), 2):
+            t = totals[a, b]
+            t[0] += 1
+            t[1] += sa > sb
+            t[2] += sa == sb
+            t[3] += sa - sb
+    return totals
+
+
+def as_dict(h2h):
+    players = h2h["players"]
+    return {
+        (players[p], players[o]): [r, w, t, m]
+        for p, o, r, w, t, m in zip(h2h["player"], h2h["opponent"], h2h["rounds"], h2h["wins"], h2h["ties"], h2h["margin"])
+    }
+
+
+def assert_matches_loop(df):
+    actual, expected = as_dict(head_to_head.records(df)), pairwise(df)
+    assert actual.keys() == expected.keys()
+    for pair, (rounds, wins, ties, margin) in expected.items():
+        assert actual[pair][:3] == [rounds, wins, ties], pair
+        assert actual[pair][3] == pytest.approx(margin), pair
+
+
+def test_records_match_pairwise_loop(scores):
+    assert_matches_loop(scores)
+
+
+def test_ties_and_missing_scores():
+    df = pd.DataFrame({
+        "round_id": [2, 1, 1, 1, 2, 2, 3],
+        "player": ["a", "a", "b", "c", "b", "c", "a"],
+        "score": pd.array([30, 25, 25, None, 28, 30, 31], dtype="Int16"),
+    })
+    assert_matches_loop(df)
+    h2h = as_dict(head_to_head.records(df))
+    # c's blank in round 1 doesn't count, and a alone in round 3 meets nobody
+    assert h2h["a", "c"] == [1, 0, 1, 0.0]
+    assert h2h["a", "b"] == [2, 1, 1, 2.0]
+    assert h2h["b", "c"] == [1, 0, 0, -2.0]
+
+
+def test_empty_frame():
+    h2h = head_to_head.records(pd.DataFrame({"round_id": [], "player": [], "score": []}))
+    assert h2h["players"] == [] and len(h2h["rounds"]) == 0
+    assert head_to_head.table(h2h).empty
+
+
+def test_table_is_symmetric(scores):
+    table = head_to_head.table(head_to_head.records(scores), min_rounds=3)
+    assert (table["Rounds"] >= 3).all()
+    assert (table["Wins"] + table["Losses"] + table["Ties"] == table["Rounds"]).all()
+    mirror = table.set_index(["Opponent", "Player"]).sort_index()
+    table = table.set_index(["Player", "Opponent"]).sort_index()
+    mirror.index.names = table.index.names
+    assert (table["Wins"] == mirror["Losses"]).all()
+    assert np.allclose(table["Avg margin"], -mirror["Avg margin"])
+    assert np.allclose(table["Win %"] + mirror["Win %"], 100)
+
+
+def test_player_record(scores):
+    h2h = head_to_head.records(scores)
+    player = h2h["players"][0]
+    rows = head_to_head.player_record(h2h, player)
+    assert "Player" not in rows and player not in set(rows["Opponent"])
+    assert rows["Rounds"].is_monotonic_decreasing
+    assert rows["Rounds"].sum() == sum(r for (a, _), (r, *_) in pairwise(scores).items() if a == player)
@@ -0,0 +1,60 @@
+import json
+
+from journal import Journal
+
+
+def test_checkpoint_then_changes(tmp_path):
+    path = str(tmp_path / "store.json")
+    saved = Journal(path)
+    assert saved.load() is None
+    saved.checkpoint({"n": 1})
+    saved.append([{"add": 2}, {"add": 3}])
+    saved.append([{"add": 4}])
+
+    loaded = Journal(path)
+    assert loaded.load() == ({"n": 1}, [{"add": 2}, {"add": 3}, {"add": 4}])
+    assert loaded.entries == 3 and not loaded.due()
+
+
+def test_checkpoint_empties_the_log(tmp_path):
+    path = str(tmp_path / "store.json")
+    saved = Journal(path, checkpoint_every=2)
+    saved.checkpoint({"n": 1})
+    saved.append([{"add": 2}, {"add": 3}])
+    assert saved.due()
+    saved.checkpoint({"n": 6})
+    assert Journal(path).load() == ({"n": 6}, [])
+
+
+def test_lines_from_an_older_generation_are_skipped(tmp_path):
+    path = str(tmp_path / "store.json")
+    saved = Journal(path)
+    saved.checkpoint({"n": 1})
+    saved.append([{"add": 2}])
+    with open(saved.log_path) as f:
+        stale = f.read()
+    saved.checkpoint({"n": 3})
+    # As if the process died before the log was emptied
+    with open(saved.log_path, "w") as f:
+        f.write(stale)
+    saved.append([{"add": 4}])
+    assert Journal(path).load() == ({"n": 3}, [{"add": 4}])
+
+
+def test_torn_last_line_forces_a_checkpoint(tmp_path):
+    path = str(tmp_path / "store.json")
+    saved = Journal(path)
+    saved.checkpoint({"n": 1})
+    saved.append([{"add": 2}])
+    with open(saved.log_path, "a") as f:
+        f.write('[1, {"ad')
+
+    loaded = Journal(path)
+    assert loaded.load() == ({"n": 1}, [{"add": 2}])
+    assert loaded.due()
+
+
+def test_plain_json_file_loads_as_a_checkpoint(tmp_path):
+    path = tmp_path / "store.json"
+    path.write_text(json.dumps({"n": 1}))
+    assert Journal(str(path)).load() == ({"n": 1}, [])
@@ -0,0 +1,168 @@
+import os
+
+import pandas as pd
+import pytest
+
+import player_stats
+from player_stats import PlayerStatsStore
+
+SINCE = "2020-07-01"
+
+
+def rebuilt(df, since=SINCE):
+    store = PlayerStatsStore(since, path=None)
+    store.rebuild(df)
+    return store
+
+
+def assert_same_summary(store, expected):
+    for min_rounds in [1, 6]:
+        pd.testing.assert_frame_equal(store.summary(min_rounds), expected.summary(min_rounds))
+
+
+def round_rows(df, round_id):
+    return df[df["round_id"] == round_id].to_dict("records")
+
+
+def test_rebuild_matches_compute_summary(scores):
+    store = rebuilt(scores)
+    for min_rounds in [1, 6]:
+        assert store.check(scores, min_rounds).empty
+
+
+def test_add_round_matches_rebuild(scores):
+    round_ids = sorted(scores["round_id"].unique())
+    cut = round_ids[-20]
+    store = rebuilt(scores[scores["round_id"] < cut])
+    for round_id in round_ids[-20:]:
+        store.add_round(round_rows(scores, round_id))
+
+    assert_same_summary(store, rebuilt(scores))
+    assert store.matches(scores)
+
+
+def test_backdated_round_matches_rebuild(scores):
+    # A new round dated on a day its players already played: dates must stay distinct
+    old = scores[scores["round_id"] == scores["round_id"].iloc[len(scores) // 2]]
+    new = old.assign(round_id=int(scores["round_id"].max()) + 1, score=old["score"] + 1)
+    full = pd.concat([scores, new], ignore_index=True)
+
+    store = rebuilt(scores)
+    store.add_round(new.to_dict("records"))
+    assert_same_summary(store, rebuilt(full))
+    counted = full[full["round_date"] >= pd.Timestamp(SINCE)].groupby("player_id")["round_date"].nunique()
+    for player_id in new["player_id"]:
+        assert len(store.players[int(player_id)]["dates"]) == counted[player_id]
+
+
+def test_rounds_before_since_are_ignored(scores):
+    early = scores[scores["round_date"] < pd.Timestamp(SINCE)]
+    store = rebuilt(scores)
+    before = store.summary(1)
+    store.add_round(round_rows(early, early["round_id"].iloc[0]))
+    pd.testing.assert_frame_equal(store.summary(1), before)
+
+
+def test_replace_players_matches_rebuild(scores):
+    recent = scores[scores["round_date"] >= pd.Timestamp(SINCE)]
+    round_id = int(recent["round_id"].iloc[len(recent) // 2])
+    rows = scores[scores["round_id"] == round_id]
+    updates = [
+        {"round_id": round_id, "player_id": int(pid), "score": int(score) + 7, "birdies": 3, "eagles": 1, "hat": True}
+        for pid, score in zip(rows["player_id"].head(3), rows["score"].head(3))
+    ]
+    player_ids = [u["player_id"] for u in updates]
+    edited = player_stats.edited_rows(scores, player_ids, updates)
+    full = pd.concat([scores[~scores["player_id"].isin(player_ids)], edited]).sort_values(
+        ["round_date", "round_id", "player_id"], ignore_index=True
+    )
+
+    store = rebuilt(scores)
+    store.replace_players(player_ids, edited)
+    assert_same_summary(store, rebuilt(full))
+    assert store.check(full).empty
+
+
+def test_edited_rows_applies_updates(scores):
+    row = scores.iloc[100]
+    update = {"round_id": int(row["round_id"]), "player_id": int(row["player_id"]), "score": 99,
+              "birdies": 0, "eagles": 0, "hat": False}
+    edited = player_stats.edited_rows(scores, [update["player_id"]], [update])
+    assert set(edited["player_id"]) == {update["player_id"]}
+    hit = edited[edited["round_id"] == update["round_id"]]
+    assert hit["score"].tolist() == [99]
+    # Other rounds are untouched
+    others = edited[edited["round_id"] != update["round_id"]]
+    expected = scores[(scores["player_id"] == update["player_id"]) & (scores["round_id"] != update["round_id"])]
+    assert others["score"].tolist() == expected["score"].tolist()
+
+
+def test_save_and_load_round_trip(scores, tmp_path):
+    path = str(tmp_path / "player_stats.json")
+    store = PlayerStatsStore(SINCE, path)
+    store.rebuild(scores)
+    store.save()
+
+    loaded = PlayerStatsStore.load(SINCE, path)
+    assert loaded is not None and not loaded.needs_rebuild
+    assert loaded.matches(scores)
+    assert_same_summary(loaded, store)
+    assert all(isinstance(e["dates"], set) for e in loaded.players.values())
+
+    # Still incremental after loading
+    new = scores[scores["round_id"] == scores["round_id"].max()].assign(round_id=int(scores["round_id"].max()) + 1)
+    loaded.add_round(new.to_dict("records"))
+    store.add_round(new.to_dict("records"))
+    assert_same_summary(loaded, store)
+
+
+def test_matches_spots_an_edit_that_keeps_the_row_count(scores):
+    store = rebuilt(scores)
+    recent = scores[scores["round_date"] >= pd.Timestamp(SINCE)]
+    edited = scores.copy()
+    edited.loc[recent.index[-1], "score"] += 1
+    assert not store.matches(edited)
+    # Rows before the start date don't count towards the totals
+    early = scores.copy()
+    early.loc[scores.index[0], "score"] += 1
+    assert store.matches(early)
+    assert not store.matches(scores.head(0))
+
+
+def test_saves_append_to_the_log(scores, tmp_path):
+    path = str(tmp_path / "player_stats.json")
+    round_ids = sorted(scores["round_id"].unique())
+    store = PlayerStatsStore(SINCE, path)
+    store.rebuild(scores[scores["round_id"] < round_ids[-3]])
+    store.save()
+    checkpoint = os.path.getsize(path)
+    for round_id in round_ids[-3:]:
+        store.add_round(round_rows(scores, round_id))
+        store.save()
+
+    rows = scores[scores["round_id"] == round_ids[-2]]
+    updates = [{"round_id": round_ids[-2], "player_id": int(pid), "score": 50, "birdies": 0, "eagles": 2, "hat": False}
+               for pid in rows["player_id"].head(2)]
+    player_ids = [u["player_id"] for u in updates]
+    edited = player_stats.edited_rows(scores, player_ids, updates)
+    store.replace_players(player_ids, edited)
+    store.save()
+    assert os.path.getsize(path) == checkpoint
+    assert store.journal.entries == 4
+
+    full = pd.concat([scores[~scores["player_id"].isin(player_ids)], edited]).sort_values(
+        ["round_date", "round_id", "player_id"], ignore_index=True
+    )
+    loaded = PlayerStatsStore.load(SINCE, path)
+    assert_same_summary(loaded, rebuilt(full))
+    assert loaded.matches(full) and not loaded.matches(scores)
+
+
+@pytest.mark.parametrize("since", ["2021-01-01", None])
+def test_load_rejects_another_start_date(scores, tmp_path, since):
+    path = str(tmp_path / "player_stats.json")
+    store = PlayerStatsStore(SINCE, path)
+    store.rebuild(scores)
+    store.save()
+    assert PlayerStatsStore.load(since, path) is None
+    assert PlayerStatsStore.load(SINCE, str(tmp_path / "missing.json")) is None
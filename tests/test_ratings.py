@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import ratings
+from ratings import RatingEngine
+
+
+def rebuilt(df):
+    engine = RatingEngine(path=None)
+    engine.rebuild(df)
+    return engine
+
+
+def assert_same_ratings(engine, expected):
+    actual, wanted = engine.table().sort_index(), expected.table().sort_index()
+    assert list(actual.index) == list(wanted.index)
+    np.testing.assert_allclose(actual["Rating"], wanted["Rating"], atol=0.01)
+    assert actual["Rounds Rated"].tolist() == wanted["Rounds Rated"].tolist()
+    assert [(d, r) for d, r, _ in engine.history] == [(d, r) for d, r, _ in expected.history]
+
+
+def round_rows(df, round_id):
+    rows = df[df["round_id"] == round_id].sort_values("player_id")
+    return rows.assign(round_date=rows["round_date"].dt.strftime("%Y-%m-%d")).to_dict("records")
+
+
+def test_round_deltas():
+    # Established players: every point one gains, another loses
+    deltas = ratings.round_deltas(np.array([1500.0, 1600.0, 1400.0]), np.array([20, 20, 20]), np.array([30.0, 25.0, 25.0]))
+    assert abs(deltas.sum()) < 1e-9
+    assert deltas[0] > 0 and deltas[1] < 0
+    # The lower-rated player gains from a tie with a higher-rated one
+    tie = ratings.round_deltas(np.array([1400.0, 1600.0]), np.array([20, 20]), np.array([25.0, 25.0]))
+    assert tie[0] > 0 > tie[1]
+
+    # New players move faster
+    provisional = ratings.round_deltas(np.array([1500.0, 1500.0]), np.array([0, 0]), np.array([30.0, 20.0]))
+    settled = ratings.round_deltas(np.array([1500.0, 1500.0]), np.array([20, 20]), np.array([30.0, 20.0]))
+    assert provisional[0] == 2 * settled[0] == ratings.K_PROVISIONAL / 2
+
+    assert ratings.round_deltas(np.array([1500.0]), np.array([3]), np.array([30.0])).tolist() == [0.0]
+
+
+def test_rebuild_rates_every_round(scores):
+    engine = rebuilt(scores)
+    assert len(engine.history) == scores["round_id"].nunique()
+    assert engine.check(scores).empty
+    counts = scores.groupby("player", observed=True).size()
+    assert engine.table()["Rounds Rated"].sort_index().tolist() == counts.sort_index().tolist()
+
+
+def test_add_round_matches_rebuild(scores):
+    round_ids = sorted(scores["round_id"].unique())
+    engine = rebuilt(scores[scores["round_id"] < round_ids[-15]])
+    for round_id in round_ids[-15:]:
+        engine.add_round(round_rows(scores, round_id))
+
+    assert engine.stale_from is None
+    assert_same_ratings(engine, rebuilt(scores))
+    assert engine.check(scores).empty
+    assert engine.round_hashes == rebuilt(scores).round_hashes
+
+
+def test_backdated_round_is_replayed(scores):
+    middle = scores[scores["round_id"] == scores["round_id"].iloc[len(scores) // 2]]
+    new = middle.assign(round_id=int(scores["round_id"].max()) + 1, score=middle["score"][::-1].to_numpy())
+    full = pd.concat([scores, new]).sort_values(["round_date", "round_id", "player_id"], ignore_index=True)
+
+    engine = rebuilt(scores)
+    engine.add_round(round_rows(new, int(new["round_id"].iloc[0])))
+    assert engine.stale_from == (new["round_date"].iloc[0].strftime("%Y-%m-%d"), int(new["round_id"].iloc[0]))
+
+    assert engine.matches(full)
+    engine.replay_from(*engine.stale_from, full)
+    assert engine.stale_from is None
+    assert_same_ratings(engine, rebuilt(full))
+    assert engine.matches(full)
+
+
+def test_replay_from_an_edit_matches_rebuild(scores):
+    round_id = int(scores["round_id"].iloc[len(scores) * 3 // 4])
+    edited = scores.copy()
+    in_round = edited["round_id"] == round_id
+    edited.loc[in_round, "score"] = edited.loc[in_round, "score"][::-1].to_numpy()
+
+    engine = rebuilt(scores)
+    round_date = edited.loc[in_round, "round_date"].iloc[0]
+    assert not engine.matches(edited)
+    engine.replay_from(round_date, round_id, edited)
+    assert_same_ratings(engine, rebuilt(edited))
+    assert engine.matches(edited)
+
+
+def test_replay_without_changes_is_a_no_op(scores):
+    engine = rebuilt(scores)
+    before = [list(h) for h in engine.history]
+    d, r, _ = engine.history[len(engine.history) // 3]
+    engine.replay_from(d, r, scores)
+    assert engine.history == before
+
+
+def test_mark_stale_keeps_the_earliest_round():
+    engine = RatingEngine(path=None)
+    engine.mark_stale("2021-05-01", 40)
+    engine.mark_stale("2021-03-01", 50)
+    engine.mark_stale("2021-06-01", 10)
+    assert engine.stale_from == ("2021-03-01", 50)
+
+
+def test_save_and_load_round_trip(scores, tmp_path):
+    path = str(tmp_path / "ratings.json")
+    engine = RatingEngine(path)
+    engine.rebuild(scores)
+    engine.save()
+
+    loaded = RatingEngine.load(path)
+    assert loaded is not None and not loaded.needs_rebuild
+    assert loaded.matches(scores)
+    assert_same_ratings(loaded, engine)
+    assert loaded.check(scores).empty
+    assert RatingEngine.load(str(tmp_path / "missing.json")) is None
+
+
+def test_saves_append_to_the_log(scores, tmp_path):
+    path = str(tmp_path / "ratings.json")
+    round_ids = sorted(scores["round_id"].unique())
+    engine = RatingEngine(path)
+    engine.rebuild(scores[scores["round_id"] < round_ids[-3]])
+    engine.save()
+    checkpoint = os.path.getsize(path)
+
+    for round_id in round_ids[-3:]:
+        engine.add_round(round_rows(scores, round_id))
+        engine.save()
+    assert os.path.getsize(path) == checkpoint
+    assert engine.journal.entries == 3
+
+    # An edit two rounds from the end logs just the rounds it re-rated
+    edited = scores.copy()
+    in_round = edited["round_id"] == round_ids[-2]
+    edited.loc[in_round, "score"] = edited.loc[in_round, "score"][::-1].to_numpy()
+    engine.replay_from(edited.loc[in_round, "round_date"].iloc[0], round_ids[-2], edited)
+    engine.save()
+    assert os.path.getsize(path) == checkpoint
+
+    loaded = RatingEngine.load(path)
+    assert loaded.matches(edited) and not loaded.matches(scores)
+    assert loaded.stale_from is None
+    assert loaded.history == engine.history
+    assert_same_ratings(loaded, rebuilt(edited))
+
+
+def test_stale_round_survives_a_restart(scores, tmp_path):
+    path = str(tmp_path / "ratings.json")
+    engine = RatingEngine(path)
+    engine.rebuild(scores)
+    engine.save()
+    middle = scores[scores["round_id"] == scores["round_id"].iloc[len(scores) // 2]]
+    new = middle.assign(round_id=int(scores["round_id"].max()) + 1)
+    engine.add_round(round_rows(new, int(new["round_id"].iloc[0])))
+    engine.save()
+    assert RatingEngine.load(path).stale_from == engine.stale_from
+
+
+def test_checkpoint_when_the_log_is_long(scores, tmp_path):
+    path = str(tmp_path / "ratings.json")
+    round_ids = sorted(scores["round_id"].unique())
+    engine = RatingEngine(path)
+    engine.journal.checkpoint_every = 2
+    engine.rebuild(scores[scores["round_id"] < round_ids[-3]])
+    engine.save()
+    for round_id in round_ids[-3:]:
+        engine.add_round(round_rows(scores, round_id))
+        engine.save()
+    assert engine.journal.entries == 0
+    assert_same_ratings(RatingEngine.load(path), rebuilt(scores))
+
+
+def test_add_columns_ranks_by_rating():
+    summary = pd.DataFrame({"Player": ["a", "b", "c"], "Average": [30.0, 31.0, 29.0]})
+    table = pd.DataFrame({"Rating": [1510.0, 1490.0, 1510.0]}, index=pd.Index(["a", "b", "c"], name="player"))
+    out = ratings.add_columns(summary, table)
+    assert out["Rating Rank"].tolist() == [1, 3, 1]
+    assert "Rating" not in summary
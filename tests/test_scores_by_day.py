@@ -0,0 +1,22 @@
+import scores_by_day
+
+TABLES = ["scores_pivot", "birdies_table", "eagles_table"]
+
+
+def test_views(scores):
+    views = scores_by_day.views(scores)
+    assert views["players"] == sorted(scores["player"].unique())
+    for name in TABLES:
+        assert len(views[name]) == scores["round_id"].nunique()
+        assert list(views[name].columns) == ["round_date", "course"] + views["players"]
+    rows = scores_by_day.player_birdies_eagles(views, views["players"][0])
+    assert len(rows) == 2 * (scores["player"] == views["players"][0]).sum()
+
+
+def test_views_of_no_scores(scores):
+    views = scores_by_day.views(scores.head(0))
+    assert views["players"] == []
+    for name in TABLES:
+        assert views[name].empty
+        assert list(views[name].columns) == ["round_date", "course"]
+    assert scores_by_day.player_birdies_eagles(views, "anyone").empty
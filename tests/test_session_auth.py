@@ -0,0 +1,109 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+import storage
+import supabase_pool
+
+
+def session(token, expires_in=3600):
+    return SimpleNamespace(access_token=token, refresh_token=f"refresh-{token}", expires_at=int(time.time()) + expires_in)
+
+
+class FakeAuth:
+    def __init__(self, refused=False):
+        self.refused = refused
+        self.calls = []
+
+    def refresh_session(self, refresh_token):
+        self.calls.append(refresh_token)
+        if self.refused:
+            raise RuntimeError("Invalid Refresh Token")
+        return SimpleNamespace(session=session(f"token{len(self.calls)}"))
+
+
+def session_auth(expires_in=3600, refused=False):
+    client = SimpleNamespace(auth=FakeAuth(refused))
+    return supabase_pool.SessionAuth(client, session("token0", expires_in)), client.auth
+
+
+def test_current_token_renews_only_near_expiry():
+    auth, fake = session_auth()
+    assert auth.current_token() == "token0"
+    assert fake.calls == []
+
+    auth, fake = session_auth(expires_in=supabase_pool.REFRESH_MARGIN - 1)
+    assert auth.current_token() == "token1"
+    assert fake.calls == ["refresh-token0"]
+    assert auth.refresh_token == "refresh-token1" and not auth.expiring()
+
+
+def test_refused_refresh_logs_out():
+    auth, _ = session_auth(expires_in=0, refused=True)
+    assert auth.current_token() is None
+    assert auth.access_token is None and auth.refresh(None) is None
+
+
+def test_stale_token_is_refreshed_once():
+    auth, fake = session_auth()
+    assert auth.refresh("token0") == "token1"
+    # A second thread that also saw token0 rejected gets the new token
+    assert auth.refresh("token0") == "token1"
+    assert len(fake.calls) == 1
+
+
+class FakeQuery:
+    def __init__(self, errors):
+        self.request = SimpleNamespace(headers={})
+        self.errors = list(errors)
+        self.sent = []
+
+    def execute(self):
+        self.sent.append(self.request.headers["Authorization"])
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(data=[])
+
+
+def expired():
+    return APIError({"code": "PGRST303", "message": "JWT expired"})
+
+
+@pytest.fixture
+def store():
+    yield storage.SupabaseStorage(SimpleNamespace(supabase_key="anon"))
+    storage.set_access_token(None)
+
+
+def test_expired_token_is_refreshed_and_retried(store):
+    auth, _ = session_auth()
+    storage.set_access_token("token0", auth.refresh)
+    query = FakeQuery([expired()])
+    store._execute(query)
+    assert query.sent == ["Bearer token0", "Bearer token1"]
+    # Later requests from this thread carry the new token straight away
+    later = FakeQuery([])
+    store._execute(later)
+    assert later.sent == ["Bearer token1"]
+
+
+def test_other_errors_and_anon_requests_are_not_retried(store):
+    auth, fake = session_auth()
+    storage.set_access_token("token0", auth.refresh)
+    with pytest.raises(APIError):
+        store._execute(FakeQuery([APIError({"code": "23505", "message": "duplicate key"})]))
+
+    storage.set_access_token(None)
+    query = FakeQuery([expired()])
+    with pytest.raises(APIError):
+        store._execute(query)
+    assert query.sent == ["Bearer anon"] and fake.calls == []
+
+
+def test_refused_refresh_raises_the_original_error(store):
+    auth, _ = session_auth(refused=True)
+    storage.set_access_token("token0", auth.refresh)
+    with pytest.raises(APIError, match="JWT expired"):
+        store._execute(FakeQuery([expired(), expired()]))
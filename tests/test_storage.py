@@ -0,0 +1,35 @@
+import pandas as pd
+
+from storage import compact_scores, top_up_scores
+
+
+class FrameStore:
+    """Serves load_scores() from a frame, as a backend would from its tables."""
+
+    def __init__(self, df):
+        self.df = df
+        self.reads = []
+
+    def load_scores(self, since_round_id=None):
+        self.reads.append(since_round_id)
+        return compact_scores(self.df[self.df["round_id"] > since_round_id].copy())
+
+
+def test_top_up_adds_new_rounds(scores):
+    newest = int(scores["round_id"].max())
+    previous = scores[scores["round_id"] < newest - 2].reset_index(drop=True)
+    pd.testing.assert_frame_equal(top_up_scores(FrameStore(scores), previous), scores)
+
+
+def test_top_up_finds_a_round_that_committed_late(scores):
+    round_ids = sorted(scores["round_id"].unique())
+    late = round_ids[-3]
+    # Loaded while the round was still being saved; two later rounds were already in
+    previous = scores[scores["round_id"] != late].reset_index(drop=True)
+    store = FrameStore(scores)
+    pd.testing.assert_frame_equal(top_up_scores(store, previous, overlap=5), scores)
+    assert store.reads == [round_ids[-1] - 5]
+
+
+def test_top_up_without_new_rounds_is_unchanged(scores):
+    pd.testing.assert_frame_equal(top_up_scores(FrameStore(scores), scores), scores)